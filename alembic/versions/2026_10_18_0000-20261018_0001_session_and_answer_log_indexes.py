@@ -0,0 +1,42 @@
+"""session and answer log indexes
+
+Revision ID: 20261018_0001
+Revises: 20260217_0001
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0001"
+down_revision = "20260217_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_sessions_user_status_created",
+        "sessions",
+        ["user_id", "status", "created_at"],
+        postgresql_include=["lesson_id"],
+    )
+    op.create_index(
+        "ix_sessions_in_progress_user_lesson",
+        "sessions",
+        ["user_id", "lesson_id"],
+        postgresql_where=sa.text("status = 'IN_PROGRESS'"),
+        sqlite_where=sa.text("status = 'IN_PROGRESS'"),
+    )
+    op.create_index(
+        "ix_quiz_answer_logs_session_slide_correct",
+        "quiz_answer_logs",
+        ["session_id", "slide_id", "is_correct"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quiz_answer_logs_session_slide_correct", table_name="quiz_answer_logs")
+    op.drop_index("ix_sessions_in_progress_user_lesson", table_name="sessions")
+    op.drop_index("ix_sessions_user_status_created", table_name="sessions")
@@ -0,0 +1,22 @@
+"""user reminder index
+
+Revision ID: 20261018_0002
+Revises: 20261018_0001
+Create Date: 2026-10-18 01:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261018_0002"
+down_revision = "20261018_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_reminder_freq_last_reminded_at", "users", ["reminder_freq", "last_reminded_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_reminder_freq_last_reminded_at", table_name="users")
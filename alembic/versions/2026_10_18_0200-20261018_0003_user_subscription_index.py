@@ -0,0 +1,26 @@
+"""user subscription index
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18 02:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "20261018_0003"
+down_revision = "20261018_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_users_subscription_status_expired_at",
+        "users",
+        ["subscription_status", "subscription_expired_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_subscription_status_expired_at", table_name="users")
@@ -0,0 +1,60 @@
+"""lesson slides
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18 03:00:00.000000
+"""
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+from enums import SlidesMenuType
+from lesson_path import LessonPath
+
+
+revision = "20261018_0004"
+down_revision = "20261018_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    lesson_slides = op.create_table(
+        "lesson_slides",
+        sa.Column("lesson_id", sa.Integer(), sa.ForeignKey("lessons.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("kind", sa.Enum(SlidesMenuType, name="slidesmenutype"), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("slide_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("lesson_id", "kind", "position", name="uq_lesson_slides_lesson_kind_position"),
+    )
+    op.create_index("ix_lesson_slides_slide_id", "lesson_slides", ["slide_id"])
+
+    lessons = sa.table("lessons", sa.column("id", sa.Integer), sa.column("path"), sa.column("path_extra"))
+    now = datetime.now(timezone.utc)
+    rows = []
+    for lesson_id, path, path_extra in op.get_bind().execute(
+        sa.select(lessons.c.id, lessons.c.path, lessons.c.path_extra)
+    ):
+        for kind, source in ((SlidesMenuType.REGULAR, path), (SlidesMenuType.EXTRA, path_extra)):
+            for position, slide_id in enumerate(LessonPath(source).path, start=1):
+                rows.append(
+                    {
+                        "lesson_id": lesson_id,
+                        "kind": kind,
+                        "position": position,
+                        "slide_id": slide_id,
+                        "created_at": now,
+                    }
+                )
+    if rows:
+        op.bulk_insert(lesson_slides, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_lesson_slides_slide_id", table_name="lesson_slides")
+    op.drop_table("lesson_slides")
+    sa.Enum(name="slidesmenutype").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,46 @@
+"""slide answer stats
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18 04:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0005"
+down_revision = "20261018_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    slide_answer_stats = op.create_table(
+        "slide_answer_stats",
+        sa.Column("slide_id", sa.Integer(), sa.ForeignKey("slides.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("correct_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("wrong_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("slide_id"),
+    )
+
+    quiz_answer_logs = sa.table(
+        "quiz_answer_logs", sa.column("slide_id", sa.Integer), sa.column("is_correct", sa.Boolean)
+    )
+    slides = sa.table("slides", sa.column("id", sa.Integer))
+    totals = (
+        sa.select(
+            quiz_answer_logs.c.slide_id,
+            sa.func.count().filter(quiz_answer_logs.c.is_correct),
+            sa.func.count().filter(sa.not_(quiz_answer_logs.c.is_correct)),
+        )
+        .where(quiz_answer_logs.c.slide_id.in_(sa.select(slides.c.id)))
+        .group_by(quiz_answer_logs.c.slide_id)
+    )
+    op.execute(slide_answer_stats.insert().from_select(["slide_id", "correct_count", "wrong_count"], totals))
+
+
+def downgrade() -> None:
+    op.drop_table("slide_answer_stats")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.append(str(SRC))
+
+from tasks.reminders import Reminder, send_reminders  # noqa: E402
+
+
+class FakeBot:
+    # Answers after `latency` seconds and, like Telegram, accepts at most `rate` messages per second.
+    def __init__(self, latency: float, rate: int) -> None:
+        self.latency = latency
+        self.interval = 1 / rate
+        self.next_slot = 0.0
+        self.sent = 0
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        await asyncio.sleep(slot - now + self.latency)
+        self.sent += 1
+
+
+async def sequential(bot: FakeBot, reminders: list[Reminder]) -> int:
+    # What process_user_reminders did before: one send, one commit and a 50 ms pause per user.
+    commits = 0
+    for reminder in reminders:
+        await bot.send_message(chat_id=reminder.telegram_id, text=reminder.text)
+        commits += 1
+        await asyncio.sleep(0.05)
+    return commits
+
+
+async def pooled(bot: FakeBot, reminders: list[Reminder], concurrency: int) -> int:
+    commits = 0
+
+    async def stream():
+        for reminder in reminders:
+            yield reminder
+
+    async def mark_reminded(user_ids: list[int]) -> None:
+        nonlocal commits
+        commits += 1
+
+    await send_reminders(bot, stream(), mark_reminded, concurrency=concurrency)
+    return commits
+
+
+async def run(args: argparse.Namespace) -> None:
+    reminders = [Reminder(user_id=i, telegram_id=i, text="reminder") for i in range(args.users)]
+    for name, send in (
+        ("sequential", lambda bot: sequential(bot, reminders)),
+        ("pooled", lambda bot: pooled(bot, reminders, args.concurrency)),
+    ):
+        bot = FakeBot(args.latency, args.rate)
+        started = time.monotonic()
+        commits = await send(bot)
+        elapsed = time.monotonic() - started
+        print(f"{name:>10}: {elapsed:7.2f} s, {bot.sent / elapsed:6.1f} msg/s, {commits} commits")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dry-run the reminder fan-out against a fake Bot.")
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated Bot API round-trip, seconds.")
+    parser.add_argument("--rate", type=int, default=30, help="Simulated global Telegram limit, msg/s.")
+    parser.add_argument("--concurrency", type=int, default=30)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
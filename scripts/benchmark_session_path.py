@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.append(str(SRC))
+
+from database.models.session import Session  # noqa: E402
+import database.tables_helper  # noqa: F401,E402
+
+
+def walk_uncached(session: Session) -> None:
+    # What show_slides paid before: every has_next()/get_slide() re-parsed the path string.
+    while session.current_step < len([int(elem) for elem in session.path.split(".")]):
+        _ = [int(elem) for elem in session.path.split(".")][session.current_step]
+        session.current_step += 1
+
+
+def walk_cached(session: Session) -> None:
+    while session.has_next():
+        _ = session.get_slide()
+        session.current_step += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare walking a lesson path with and without the parsed-path memo."
+    )
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    path = ".".join(str(slide_id) for slide_id in range(1000, 1000 + args.slides))
+    results = {}
+    for name, walk in (("uncached", walk_uncached), ("cached", walk_cached)):
+        session = Session(path=path, current_step=0, in_extra=False)
+
+        def run(session=session, walk=walk) -> None:
+            session.current_step = 0
+            walk(session)
+
+        results[name] = min(timeit.repeat(run, number=args.runs, repeat=5)) / args.runs
+    for name, seconds in results.items():
+        print(f"{name:>9}: {seconds * 1_000_000:10.1f} us per {args.slides}-slide walk")
+    print(f"  speedup: {results['uncached'] / results['cached']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
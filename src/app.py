@@ -1,7 +1,9 @@
 import logging.config
 
+from redis.asyncio import Redis
 import sentry_sdk
 from config import get_logging_config, get_settings
+from database.invalidation import get_invalidation_channel, setup_invalidation_publisher
 from enums import Stage
 from webapp.create_app import create_app
 
@@ -22,5 +24,6 @@ if settings.SENTRY_FASTAPI_DSN and settings.STAGE == Stage.PROD:
         profiles_sample_rate=1.0,
     )
 
+setup_invalidation_publisher(Redis.from_url(settings.REDIS_URL), get_invalidation_channel(settings.STAGE))
 app = create_app()
 logger.info("webapp started")
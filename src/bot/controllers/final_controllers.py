@@ -1,11 +1,9 @@
 import logging
 from contextlib import suppress
-from typing import TYPE_CHECKING
 
 from aiogram import types
 from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramNotFound
 from aiogram.fsm.context import FSMContext
-from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.keyboards.keyboards import (
@@ -18,68 +16,31 @@ from database.crud.lesson import (
     get_active_and_editing_lessons,
     get_active_lessons,
     get_completed_lessons_from_sessions,
-    get_lesson_by_id,
 )
-from database.crud.session import (
-    get_error_counter_from_slides,
-    update_session_status,
-)
-from database.crud.slide import find_first_exam_slide_id, get_quiz_slides_by_mode
+from database.crud.session import SessionReport, get_session_report, update_session_status
 from database.models.session import Session
-from enums import QuizType, SessionStartsFrom, SessionStatus
-
-if TYPE_CHECKING:
-    from database.models.lesson import Lesson
+from database.quiz_answer_buffer import quiz_answer_log_buffer
+from enums import SessionStartsFrom, SessionStatus
 
 logger = logging.getLogger(__name__)
 
 
-class StatsCalculationResults(BaseModel):
-    exercises: int
-    correct_answers: int
-
-
-class UserStats(BaseModel):
-    regular_exercises: int | None
-    exam_exercises: int | None = None
-    correct_regular_answers: int | None
-    correct_exam_answers: int | None = None
-
-
-async def calculate_user_stats_from_slides(
-    slides: set[int],
-    session_id: int,
-    db_session: AsyncSession,
-) -> StatsCalculationResults:
-    all_right_answers_in_slides = len(slides) - await get_error_counter_from_slides(
-        session_id=session_id,
-        slides_set=slides,
-        db_session=db_session,
-    )
-    stats = StatsCalculationResults(
-        exercises=len(slides),
-        correct_answers=all_right_answers_in_slides,
-    )
-    return stats
-
-
 async def show_stats(
     event: types.Message,
-    stats: UserStats,
+    report: SessionReport,
     session: Session,
     db_session: AsyncSession,
     markup: types.InlineKeyboardMarkup | None = None,
 ) -> None:
-    lesson = await get_lesson_by_id(lesson_id=session.lesson_id, db_session=db_session)
-    exam_slide_id = await find_first_exam_slide_id(session.get_path(), db_session)
+    lesson = report.lesson
     match session.starts_from:
         case SessionStartsFrom.BEGIN:
-            if not exam_slide_id:
+            if not report.first_exam_slide_id:
                 await event.answer(
                     text=(await get_text_by_prompt(prompt="final_report_without_exam", db_session=db_session)).format(
                         lesson.title,
-                        stats.correct_regular_answers,
-                        stats.regular_exercises,
+                        report.correct_regular_answers,
+                        report.regular_exercises,
                     ),
                     reply_markup=markup,
                 )
@@ -87,10 +48,10 @@ async def show_stats(
             await event.answer(
                 text=(await get_text_by_prompt(prompt="final_report_from_begin", db_session=db_session)).format(
                     lesson.title,
-                    stats.correct_regular_answers,
-                    stats.regular_exercises,
-                    stats.correct_exam_answers,
-                    stats.exam_exercises,
+                    report.correct_regular_answers,
+                    report.regular_exercises,
+                    report.correct_exam_answers,
+                    report.exam_exercises,
                 ),
                 reply_markup=markup,
             )
@@ -98,8 +59,8 @@ async def show_stats(
             await event.answer(
                 text=(await get_text_by_prompt(prompt="final_report_from_exam", db_session=db_session)).format(
                     lesson.title,
-                    stats.correct_exam_answers,
-                    stats.exam_exercises,
+                    report.correct_exam_answers,
+                    report.exam_exercises,
                 ),
                 reply_markup=markup,
             )
@@ -110,11 +71,11 @@ async def show_stats(
 
 async def show_stats_extra(
     event: types.Message,
-    stats: StatsCalculationResults,
+    report: SessionReport,
     session: Session,
     db_session: AsyncSession,
 ) -> None:
-    lesson = await get_lesson_by_id(lesson_id=session.lesson_id, db_session=db_session)
+    lesson = report.lesson
     if event.from_user.id not in get_settings().TEACHERS:
         lessons = await get_active_lessons(db_session)
     else:
@@ -124,8 +85,8 @@ async def show_stats_extra(
     await event.answer(
         text=(await get_text_by_prompt(prompt="final_report_extra", db_session=db_session)).format(
             lesson.title,
-            stats.correct_answers,
-            stats.exercises,
+            report.correct_regular_answers,
+            report.regular_exercises,
         ),
         reply_markup=lesson_picker_kb,
     )
@@ -152,24 +113,13 @@ async def show_extra_slides_dialog(
 async def finalizing(event: types.Message, state: FSMContext, session: Session, db_session: AsyncSession):
     with suppress(TelegramBadRequest, TelegramForbiddenError, TelegramNotFound):
         await event.bot.unpin_all_chat_messages(chat_id=event.from_user.id)
-    slides_ids = session.get_path()
-    regular_quiz_slides = await get_quiz_slides_by_mode(
-        slides_ids=slides_ids, mode=QuizType.REGULAR, db_session=db_session
-    )
-    exam_quiz_slides = await get_quiz_slides_by_mode(slides_ids=slides_ids, mode=QuizType.EXAM, db_session=db_session)
-    results_regular = await calculate_user_stats_from_slides(regular_quiz_slides, session.id, db_session)
-    results_exam = await calculate_user_stats_from_slides(exam_quiz_slides, session.id, db_session)
-    user_stats = UserStats(
-        regular_exercises=len(regular_quiz_slides),
-        exam_exercises=len(exam_quiz_slides),
-        correct_regular_answers=results_regular.correct_answers,
-        correct_exam_answers=results_exam.correct_answers,
-    )
-    lesson: Lesson = await get_lesson_by_id(session.lesson_id, db_session)
-    if lesson.errors_threshold is not None and user_stats.exam_exercises > 0:
-        percentage = (user_stats.correct_exam_answers / user_stats.exam_exercises) * 100
+    await quiz_answer_log_buffer.flush()
+    report = await get_session_report(session, db_session)
+    lesson = report.lesson
+    if lesson.errors_threshold is not None and report.exam_exercises > 0:
+        percentage = (report.correct_exam_answers / report.exam_exercises) * 100
         if percentage < lesson.errors_threshold:
-            await show_stats(event, user_stats, session, db_session)
+            await show_stats(event, report, session, db_session)
             await show_extra_slides_dialog(event, db_session)
             return
     if event.from_user.id not in get_settings().TEACHERS:
@@ -179,16 +129,13 @@ async def finalizing(event: types.Message, state: FSMContext, session: Session,
     await finish_session(session, db_session)
     completed_lessons = await get_completed_lessons_from_sessions(user_id=session.user_id, db_session=db_session)
     markup = get_lesson_picker_keyboard(lessons=lessons, completed_lessons=completed_lessons)
-    await show_stats(event, user_stats, session, db_session, markup=markup)
+    await show_stats(event, report, session, db_session, markup=markup)
     await state.clear()
 
 
 async def finalizing_extra(event: types.Message, state: FSMContext, session: Session, db_session: AsyncSession):
-    slides_ids = session.get_path()
-    regular_quiz_slides = await get_quiz_slides_by_mode(
-        slides_ids=slides_ids, mode=QuizType.REGULAR, db_session=db_session
-    )
-    results_regular = await calculate_user_stats_from_slides(regular_quiz_slides, session.id, db_session)
+    await quiz_answer_log_buffer.flush()
+    report = await get_session_report(session, db_session)
     await finish_session(session, db_session)
-    await show_stats_extra(event, results_regular, session, db_session)
+    await show_stats_extra(event, report, session, db_session)
     await state.clear()
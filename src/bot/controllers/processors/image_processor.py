@@ -4,14 +4,14 @@ from pathlib import Path
 from aiogram import types
 
 from bot.keyboards.keyboards import get_further_button
+from database.lesson_plan import PlannedSlide
 from database.models.session import Session
-from database.models.slide import Slide
 from enums import KeyboardType
 
 
 async def process_image(
     event: types.Message,
-    slide: Slide,
+    slide: PlannedSlide,
     session: Session,
 ) -> bool:
     markup = None
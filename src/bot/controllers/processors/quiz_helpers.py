@@ -2,11 +2,14 @@ import logging
 
 import sentry_sdk
 from aiogram import types
+from aiogram.fsm.context import FSMContext
 
 from bot.keyboards.keyboards import get_hint_keyboard
 from database.crud.answer import get_text_by_prompt
-from database.crud.session import get_wrong_answers_counter
-from database.models.slide import Slide
+from database.crud.quiz_answer import log_quiz_answer
+from database.crud.session import get_wrong_answers_by_slide
+from database.lesson_plan import PlannedSlide
+from database.quiz_answer_buffer import quiz_answer_log_buffer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
@@ -24,14 +27,35 @@ async def show_hint_dialog(
     )
 
 
-async def error_count_exceeded(session_id: int, slide_id: int, db_session: AsyncSession) -> bool:
-    wrong_answers_count = await get_wrong_answers_counter(session_id, slide_id, db_session)
-    if wrong_answers_count >= 3:
+async def _get_wrong_answers(state: FSMContext, session_id: int, db_session: AsyncSession) -> dict:
+    wrong_answers = (await state.get_data()).get("wrong_answers")
+    if wrong_answers is None or wrong_answers["session_id"] != session_id:
+        await quiz_answer_log_buffer.flush()
+        counters = await get_wrong_answers_by_slide(session_id, db_session)
+        wrong_answers = {
+            "session_id": session_id,
+            "slides": {str(slide_id): count for slide_id, count in counters.items()},
+        }
+        await state.update_data(wrong_answers=wrong_answers)
+    return wrong_answers
+
+
+async def log_wrong_answer(state: FSMContext, session_id: int, slide: PlannedSlide, db_session: AsyncSession) -> None:
+    wrong_answers = await _get_wrong_answers(state, session_id, db_session)
+    await log_quiz_answer(session_id, slide.id, slide.slide_type, False, db_session)
+    slides = wrong_answers["slides"]
+    slides[str(slide.id)] = slides.get(str(slide.id), 0) + 1
+    await state.update_data(wrong_answers=wrong_answers)
+
+
+async def error_count_exceeded(state: FSMContext, session_id: int, slide_id: int, db_session: AsyncSession) -> bool:
+    wrong_answers = await _get_wrong_answers(state, session_id, db_session)
+    if wrong_answers["slides"].get(str(slide_id), 0) >= 3:
         return True
     return False
 
 
-def _report_missing_almost_right_answer_reply(slide: Slide) -> None:
+def _report_missing_almost_right_answer_reply(slide: PlannedSlide) -> None:
     if slide.id in _missing_almost_right_answer_reply_reported:
         return
     _missing_almost_right_answer_reply_reported.add(slide.id)
@@ -49,7 +73,7 @@ def _report_missing_almost_right_answer_reply(slide: Slide) -> None:
         sentry_sdk.capture_message(message, level="warning")
 
 
-async def answer_almost_right_reply(event: types.Message, slide: Slide, db_session: AsyncSession) -> None:
+async def answer_almost_right_reply(event: types.Message, slide: PlannedSlide, db_session: AsyncSession) -> None:
     reply = slide.almost_right_answer_reply
     if not reply or not str(reply).strip():
         _report_missing_almost_right_answer_reply(slide)
@@ -7,11 +7,16 @@ from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.controllers.processors.input_models import UserInputHint, UserInputMsg, UserQuizInput
-from bot.controllers.processors.quiz_helpers import answer_almost_right_reply, error_count_exceeded, show_hint_dialog
+from bot.controllers.processors.quiz_helpers import (
+    answer_almost_right_reply,
+    error_count_exceeded,
+    log_wrong_answer,
+    show_hint_dialog,
+)
 from database.crud.answer import get_random_answer, get_text_by_prompt
 from database.crud.quiz_answer import log_quiz_answer
+from database.lesson_plan import PlannedSlide
 from database.models.session import Session
-from database.models.slide import Slide
 from enums import ReactionType, States
 from webapp.controllers.misc import normalize_apostrophes, trim_non_alpha
 
@@ -19,7 +24,7 @@ from webapp.controllers.misc import normalize_apostrophes, trim_non_alpha
 async def show_quiz_input_phrase(
     event: types.Message,
     state: FSMContext,
-    slide: Slide,
+    slide: PlannedSlide,
 ) -> bool:
     msg = await event.answer(text=slide.text)
     await state.update_data(quiz_phrase_msg_id=msg.message_id)
@@ -31,7 +36,7 @@ async def process_quiz_input_phrase(
     event: types.Message,
     state: FSMContext,
     user_input: UserQuizInput,
-    slide: Slide,
+    slide: PlannedSlide,
     session: Session,
     db_session: AsyncSession,
 ) -> bool:
@@ -44,7 +49,7 @@ async def process_quiz_input_phrase(
                     await event.delete_reply_markup()
                 await event.answer(
                     text=(await get_text_by_prompt(prompt="right_answer", db_session=db_session)).format(
-                        slide.right_answers if "|" not in slide.right_answers else slide.right_answers.split("|")[0],
+                        slide.right_answers_variants[0],
                     ),
                 )
                 await asyncio.sleep(2)
@@ -56,25 +61,28 @@ async def process_quiz_input_phrase(
         case UserInputMsg() as input_msg:
             trimmed_user_input = normalize_apostrophes(trim_non_alpha(input_msg.text).lower())
             right_answers = [
-                normalize_apostrophes(trim_non_alpha(answer.lower())) for answer in slide.right_answers.split("|")
+                normalize_apostrophes(trim_non_alpha(answer.lower())) for answer in slide.right_answers_variants
             ]
             almost_right_answers = [
-                normalize_apostrophes(trim_non_alpha(answer.lower()))
-                for answer in (slide.almost_right_answers or "").split("|")
+                normalize_apostrophes(trim_non_alpha(answer.lower())) for answer in slide.almost_right_answers_variants
             ]
 
             if trimmed_user_input in right_answers:
-                await event.answer(text=await get_random_answer(mode=ReactionType.RIGHT, db_session=db_session))
+                await event.answer(
+                    text=await get_random_answer(mode=ReactionType.RIGHT, db_session=db_session, chat_id=event.chat.id)
+                )
                 await log_quiz_answer(session.id, slide.id, slide.slide_type, True, db_session)
                 return True
             elif trimmed_user_input in almost_right_answers:
                 await answer_almost_right_reply(event, slide, db_session)
                 await log_quiz_answer(session.id, slide.id, slide.slide_type, True, db_session)
                 return True
-            await log_quiz_answer(session.id, slide.id, slide.slide_type, False, db_session)
-            await event.answer(text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session))
+            await log_wrong_answer(state, session.id, slide, db_session)
+            await event.answer(
+                text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session, chat_id=event.chat.id)
+            )
 
-            if await error_count_exceeded(session.id, slide.id, db_session):
+            if await error_count_exceeded(state, session.id, slide.id, db_session):
                 await show_hint_dialog(event, db_session)
                 return False
 
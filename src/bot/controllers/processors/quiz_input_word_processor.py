@@ -8,11 +8,16 @@ from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.controllers.processors.input_models import UserInputHint, UserInputMsg, UserQuizInput
-from bot.controllers.processors.quiz_helpers import answer_almost_right_reply, error_count_exceeded, show_hint_dialog
+from bot.controllers.processors.quiz_helpers import (
+    answer_almost_right_reply,
+    error_count_exceeded,
+    log_wrong_answer,
+    show_hint_dialog,
+)
 from database.crud.answer import get_random_answer, get_text_by_prompt
 from database.crud.quiz_answer import log_quiz_answer
+from database.lesson_plan import PlannedSlide
 from database.models.session import Session
-from database.models.slide import Slide
 from enums import ReactionType, States
 from webapp.controllers.misc import normalize_apostrophes, trim_non_alpha
 
@@ -20,7 +25,7 @@ from webapp.controllers.misc import normalize_apostrophes, trim_non_alpha
 async def show_quiz_input_word(
     event: types.Message,
     state: FSMContext,
-    slide: Slide,
+    slide: PlannedSlide,
 ) -> bool:
     msg = await event.answer(text=slide.text.replace("_", "…"))
     await state.update_data(quiz_word_msg_id=msg.message_id)
@@ -30,7 +35,7 @@ async def show_quiz_input_word(
 
 async def response_input_word_correct(
     event: types.Message,
-    slide: Slide,
+    slide: PlannedSlide,
     user_input_text: str,
     state: FSMContext,
     session: Session,
@@ -52,13 +57,15 @@ async def response_input_word_correct(
             )
     except KeyError:
         logging.exception("something went wrong with quiz_input_word")
-    await event.answer(text=await get_random_answer(mode=ReactionType.RIGHT, db_session=db_session))
+    await event.answer(
+        text=await get_random_answer(mode=ReactionType.RIGHT, db_session=db_session, chat_id=event.chat.id)
+    )
     await log_quiz_answer(session.id, slide.id, slide.slide_type, True, db_session)
 
 
 async def response_input_word_almost_correct(
     event: types.Message,
-    slide: Slide,
+    slide: PlannedSlide,
     user_input_text: str,
     state: FSMContext,
     session: Session,
@@ -88,7 +95,7 @@ async def process_quiz_input_word(
     event: types.Message,
     state: FSMContext,
     user_input: UserQuizInput,
-    slide: Slide,
+    slide: PlannedSlide,
     session: Session,
     db_session: AsyncSession,
 ) -> bool:
@@ -102,7 +109,7 @@ async def process_quiz_input_word(
                     await event.delete_reply_markup()
                 await event.answer(
                     text=(await get_text_by_prompt(prompt="right_answer", db_session=db_session)).format(
-                        slide.right_answers if "|" not in slide.right_answers else slide.right_answers.split("|")[0],
+                        slide.right_answers_variants[0],
                     ),
                 )
                 await asyncio.sleep(2)
@@ -114,11 +121,10 @@ async def process_quiz_input_word(
         case UserInputMsg() as input_msg:
             trimmed_user_input = normalize_apostrophes(trim_non_alpha(input_msg.text).lower())
             right_answers = [
-                normalize_apostrophes(trim_non_alpha(answer.lower())) for answer in slide.right_answers.split("|")
+                normalize_apostrophes(trim_non_alpha(answer.lower())) for answer in slide.right_answers_variants
             ]
             almost_right_answers = [
-                normalize_apostrophes(trim_non_alpha(answer.lower()))
-                for answer in (slide.almost_right_answers or "").split("|")
+                normalize_apostrophes(trim_non_alpha(answer.lower())) for answer in slide.almost_right_answers_variants
             ]
 
             if trimmed_user_input in right_answers:
@@ -128,10 +134,12 @@ async def process_quiz_input_word(
                 await response_input_word_almost_correct(event, slide, trimmed_user_input, state, session, db_session)
                 return True
 
-            await log_quiz_answer(session.id, slide.id, slide.slide_type, False, db_session)
-            await event.answer(text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session))
+            await log_wrong_answer(state, session.id, slide, db_session)
+            await event.answer(
+                text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session, chat_id=event.chat.id)
+            )
 
-            if await error_count_exceeded(session.id, slide.id, db_session):
+            if await error_count_exceeded(state, session.id, slide.id, db_session):
                 await show_hint_dialog(event, db_session)
                 return False
             await show_quiz_input_word(event, state, slide)
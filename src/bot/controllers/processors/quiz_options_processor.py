@@ -9,22 +9,22 @@ from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.controllers.processors.input_models import UserInputHint, UserInputMsg, UserQuizInput
-from bot.controllers.processors.quiz_helpers import error_count_exceeded, show_hint_dialog
+from bot.controllers.processors.quiz_helpers import error_count_exceeded, log_wrong_answer, show_hint_dialog
 from bot.keyboards.keyboards import get_quiz_keyboard
 from database.crud.answer import get_random_answer, get_text_by_prompt
 from database.crud.quiz_answer import log_quiz_answer
+from database.lesson_plan import PlannedSlide
 from database.models.session import Session
-from database.models.slide import Slide
 from enums import ReactionType
 
 
 async def show_quiz_options(
     event: types.Message,
     state: FSMContext,
-    slide: Slide,
+    slide: PlannedSlide,
 ) -> bool:
     right_answer = slide.right_answers
-    wrong_answers = slide.keyboard.split("|")
+    wrong_answers = slide.keyboard_variants
     elements = [right_answer, *wrong_answers]
     options = sample(population=elements, k=len(elements))
     markup = get_quiz_keyboard(words=options)
@@ -35,7 +35,7 @@ async def show_quiz_options(
 
 async def response_options_correct(
     event: types.Message,
-    slide: Slide,
+    slide: PlannedSlide,
     session: Session,
     db_session: AsyncSession,
 ) -> None:
@@ -52,19 +52,23 @@ async def response_options_correct(
             )
     except KeyError:
         logging.exception("something went wrong with quiz_options")
-    await event.answer(text=await get_random_answer(mode=ReactionType.RIGHT, db_session=db_session))
+    await event.answer(
+        text=await get_random_answer(mode=ReactionType.RIGHT, db_session=db_session, chat_id=event.chat.id)
+    )
     await log_quiz_answer(session.id, slide.id, slide.slide_type, True, db_session)
 
 
 async def response_options_wrong(
     event: types.Message,
-    slide: Slide,
+    slide: PlannedSlide,
     state: FSMContext,
     session: Session,
     db_session: AsyncSession,
 ) -> None:
-    await event.answer(text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session))
-    await log_quiz_answer(session.id, slide.id, slide.slide_type, False, db_session)
+    await event.answer(
+        text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session, chat_id=event.chat.id)
+    )
+    await log_wrong_answer(state, session.id, slide, db_session)
     await show_quiz_options(event, state, slide)
 
 
@@ -72,7 +76,7 @@ async def process_quiz_options(
     event: types.Message,
     state: FSMContext,
     user_input: UserQuizInput,
-    slide: Slide,
+    slide: PlannedSlide,
     session: Session,
     db_session: AsyncSession,
 ) -> bool:
@@ -96,11 +100,15 @@ async def process_quiz_options(
             if input_msg.text.lower() == slide.right_answers.lower():
                 await response_options_correct(event, slide, session, db_session)
                 return True
-            await log_quiz_answer(session.id, slide.id, slide.slide_type, False, db_session)
-            if await error_count_exceeded(session.id, slide.id, db_session):
-                await event.answer(text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session))
+            await log_wrong_answer(state, session.id, slide, db_session)
+            if await error_count_exceeded(state, session.id, slide.id, db_session):
+                await event.answer(
+                    text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session, chat_id=event.chat.id)
+                )
                 await show_hint_dialog(event, db_session)
                 return False
-            await event.answer(text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session))
+            await event.answer(
+                text=await get_random_answer(mode=ReactionType.WRONG, db_session=db_session, chat_id=event.chat.id)
+            )
             await show_quiz_options(event, state, slide)
             return False
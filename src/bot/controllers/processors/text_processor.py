@@ -3,13 +3,13 @@ import asyncio
 from aiogram import types
 
 from bot.keyboards.keyboards import get_further_button
-from database.models.slide import Slide
+from database.lesson_plan import PlannedSlide
 from enums import KeyboardType
 
 
 async def process_text(
     event: types.Message,
-    slide: Slide,
+    slide: PlannedSlide,
 ) -> bool:
     markup = None
     if slide.keyboard_type == KeyboardType.FURTHER:
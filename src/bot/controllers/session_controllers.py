@@ -0,0 +1,87 @@
+from datetime import datetime
+from time import time
+from typing import Any
+
+from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from consts import SESSION_SNAPSHOT_TTL
+from database.invalidation import register_invalidation_handler
+from database.models.session import Session
+from enums import CacheScope, SessionStartsFrom, SessionStatus
+
+# When sessions were last aborted behind the bot's back, per lesson; snapshots saved earlier are not trusted.
+_sessions_aborted_at: dict[int, float] = {}
+_all_sessions_aborted_at = 0.0
+
+
+def _on_sessions_aborted(lesson_id: str | None) -> None:
+    global _all_sessions_aborted_at
+    if lesson_id is None:
+        _all_sessions_aborted_at = time()
+    else:
+        _sessions_aborted_at[int(lesson_id)] = time()
+
+
+register_invalidation_handler(CacheScope.SESSIONS, _on_sessions_aborted)
+
+
+def _dump_session(session: Session) -> dict[str, Any]:
+    return {
+        "id": session.id,
+        "created_at": session.created_at.isoformat(),
+        "lesson_id": session.lesson_id,
+        "user_id": session.user_id,
+        "path": session.path,
+        "path_extra": session.path_extra,
+        "current_step": session.current_step,
+        "starts_from": session.starts_from.name,
+        "status": session.status.name,
+        "in_extra": session.in_extra,
+        "saved_at": time(),
+    }
+
+
+def _load_session(snapshot: dict[str, Any]) -> Session:
+    return Session(
+        id=snapshot["id"],
+        created_at=datetime.fromisoformat(snapshot["created_at"]),
+        lesson_id=snapshot["lesson_id"],
+        user_id=snapshot["user_id"],
+        path=snapshot["path"],
+        path_extra=snapshot["path_extra"],
+        current_step=snapshot["current_step"],
+        starts_from=SessionStartsFrom[snapshot["starts_from"]],
+        status=SessionStatus[snapshot["status"]],
+        in_extra=snapshot["in_extra"],
+        completed_at=None,
+    )
+
+
+def restore_session(state_data: dict[str, Any], db_session: AsyncSession) -> Session | None:
+    snapshot = state_data.get("session_snapshot")
+    if snapshot is None or snapshot["id"] != state_data.get("session_id"):
+        return None
+    saved_at = snapshot["saved_at"]
+    aborted_at = max(_all_sessions_aborted_at, _sessions_aborted_at.get(snapshot["lesson_id"], 0.0))
+    if saved_at <= aborted_at or time() - saved_at > SESSION_SNAPSHOT_TTL:
+        return None
+    session = _load_session(snapshot)
+    # Attached as if just loaded: later changes are flushed as UPDATEs without a SELECT first.
+    make_transient_to_detached(session)
+    db_session.add(session)
+    return session
+
+
+async def save_session(state: FSMContext, session: Session, db_session: AsyncSession) -> None:
+    # The snapshot is trusted without asking Postgres, so it must never run ahead of what is committed.
+    await db_session.commit()
+    snapshot = _dump_session(session) if session.status == SessionStatus.IN_PROGRESS else None
+    await state.update_data(session_id=session.id, session_snapshot=snapshot)
+
+
+async def drop_session_snapshot(state: FSMContext) -> None:
+    state_data = await state.get_data()
+    if state_data.get("session_snapshot") is not None:
+        await state.update_data(session_snapshot=None)
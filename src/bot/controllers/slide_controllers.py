@@ -1,6 +1,5 @@
 import logging
 
-from contextlib import asynccontextmanager
 from aiogram import types
 from aiogram.fsm.context import FSMContext
 from bot.controllers.final_controllers import finalizing, finalizing_extra
@@ -12,9 +11,9 @@ from bot.controllers.processors.quiz_input_word_processor import process_quiz_in
 from bot.controllers.processors.quiz_options_processor import process_quiz_options
 from bot.controllers.processors.sticker_processor import process_sticker
 from bot.controllers.processors.text_processor import process_text
-from database.crud.slide import get_slide_by_id
+from bot.internal.leases import user_lease
+from database.lesson_plan import PlannedSlide, get_lesson_plan
 from database.models.session import Session
-from database.models.slide import Slide
 from enums import SlideType
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,7 +23,7 @@ logger = logging.getLogger(__name__)
 async def process_slide(
     event: types.Message,
     state: FSMContext,
-    slide: Slide,
+    slide: PlannedSlide,
     session: Session,
     db_session: AsyncSession,
     user_input: UserQuizInput | None,
@@ -49,18 +48,6 @@ async def process_slide(
             raise AssertionError(msg)
 
 
-@asynccontextmanager
-async def paranoid(state: FSMContext):
-    data = await state.get_data()
-    if "slide_in_progress" in data:
-        assert data["slide_in_progress"] is False
-    await state.update_data(slide_in_progress=True)
-    try:
-        yield
-    finally:
-        await state.update_data(slide_in_progress=False)
-
-
 async def show_slides(
     event: types.Message,
     state: FSMContext,
@@ -68,20 +55,34 @@ async def show_slides(
     db_session: AsyncSession,
     user_input: UserQuizInput | None = None,
 ) -> None:
-    while session.has_next():
-        async with paranoid(state):
-            current_slide_id = session.get_slide()
-            current_slide = await get_slide_by_id(current_slide_id, db_session)
-            logger.info(f"Processing step={session.current_step}, slide_id={current_slide_id}")
-            need_next = await process_slide(event, state, current_slide, session, db_session, user_input)
-            user_input = None
-            if not need_next:
-                logger.info("returning...")
-                return
+    async with user_lease(session.user_id) as acquired:
+        if not acquired:
+            logger.warning(f"Slides are already being shown to user {session.user_id}, skipping update")
+            return
+        await _show_slides(event, state, session, db_session, user_input)
+
+
+async def _show_slides(
+    event: types.Message,
+    state: FSMContext,
+    session: Session,
+    db_session: AsyncSession,
+    user_input: UserQuizInput | None,
+) -> None:
+    plan = await get_lesson_plan(session.lesson_id, session.path, session.path_extra, db_session)
+    while session.current_step < len(steps := plan.get_steps(session.in_extra)):
+        current_slide_id = steps[session.current_step]
+        current_slide = plan.get_slide(current_slide_id)
+        logger.info(f"Processing step={session.current_step}, slide_id={current_slide_id}")
+        need_next = await process_slide(event, state, current_slide, session, db_session, user_input)
+        user_input = None
+        if not need_next:
+            logger.info("returning...")
+            return
 
-            logger.info("continuing...")
-            session.current_step += 1
-            await db_session.flush()
+        logger.info("continuing...")
+        session.current_step += 1
+        await db_session.flush()
 
     if session.in_extra:
         logger.info("finalizing extra...")
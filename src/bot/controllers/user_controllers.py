@@ -206,8 +206,7 @@ async def daily_routine(bot: Bot, db_connector: DatabaseConnector):
         await asyncio.sleep(seconds_to_sleep)
     while True:
         try:
-            async with db_connector.session_factory.begin() as session:
-                await collect_garbage(session)
+            await collect_garbage(db_connector)
 
             async with db_connector.session_factory() as session:
                 almost_over_text = await get_text_by_prompt(prompt="subscribtion_almost_over", db_session=session)
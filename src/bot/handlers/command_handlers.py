@@ -6,8 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from bot.controllers.user_controllers import propose_reminder_to_user, show_start_menu
 from bot.keyboards.keyboards import get_premium_keyboard
 from database.crud.answer import get_text_by_prompt
+from database.invalidation import commit_and_invalidate
 from database.models.user import User
-from enums import UserSubscriptionType
+from enums import CacheScope, UserSubscriptionType
 
 router = Router()
 
@@ -35,6 +36,7 @@ async def premium_message(message: types.Message, user: User, db_session: AsyncS
     )
     if user.subscription_status == UserSubscriptionType.NO_ACCESS:
         user.subscription_status = UserSubscriptionType.ACCESS_INFO_REQUESTED
+        await commit_and_invalidate(db_session, CacheScope.USERS, user.telegram_id)
 
 
 @router.message(Command("reminders"))
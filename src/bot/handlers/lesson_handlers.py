@@ -5,6 +5,7 @@ from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bot.controllers.session_controllers import save_session
 from bot.controllers.slide_controllers import show_slides
 from bot.controllers.user_controllers import show_start_menu
 from bot.keyboards.callback_data import (
@@ -16,13 +17,20 @@ from bot.keyboards.keyboards import get_lesson_progress_keyboard
 from database.crud.answer import get_text_by_prompt
 from database.crud.lesson import get_lesson_by_id
 from database.crud.session import get_current_session, update_session_status
-from database.crud.slide import find_first_exam_slide_id
 from database.crud.user import set_user_reminders
+from database.invalidation import commit_and_invalidate
+from database.lesson_plan import get_lesson_plan
 from database.models.lesson import Lesson
 from database.models.session import Session
 from database.models.user import User
-from enums import LessonStartsFrom, SessionStatus, UserLessonProgress, UserSubscriptionType, lesson_to_session
-from lesson_path import LessonPath
+from enums import (
+    CacheScope,
+    LessonStartsFrom,
+    SessionStatus,
+    UserLessonProgress,
+    UserSubscriptionType,
+    lesson_to_session,
+)
 
 router = Router()
 
@@ -41,13 +49,11 @@ async def lesson_callback_processing(
 
     session = await get_current_session(user_id=user.id, lesson_id=callback_data.lesson_id, db_session=db_session)
     lesson = await get_lesson_by_id(lesson_id=callback_data.lesson_id, db_session=db_session)
-    lesson_path = LessonPath(lesson.path).path
-    slides_count = len(lesson_path)
-    if slides_count == 0:
+    plan = await get_lesson_plan(lesson.id, lesson.path, lesson.path_extra, db_session)
+    if len(plan.path) == 0:
         await callback.message.answer(text="no slides yet in this lesson")
         return
-    first_exam_slide = await find_first_exam_slide_id(lesson_path, db_session)
-    has_exam_slides = first_exam_slide is not None
+    has_exam_slides = plan.first_exam_index is not None
     if lesson.is_paid and user.subscription_status not in (
         UserSubscriptionType.UNLIMITED_ACCESS,
         UserSubscriptionType.LIMITED_ACCESS,
@@ -79,11 +85,9 @@ async def lesson_callback_processing(
 async def prepare_session(lesson: Lesson, db_session: AsyncSession, attr: LessonStartsFrom, user_id: int) -> Session:
     path = lesson.path
     if attr == LessonStartsFrom.EXAM:
-        path_list = LessonPath(path).path
-        first_exam_slide_id = await find_first_exam_slide_id(path_list, db_session)
-        if first_exam_slide_id:
-            path_start_index = path_list.index(first_exam_slide_id)
-            path = ".".join(map(str, path_list[path_start_index:]))
+        plan = await get_lesson_plan(lesson.id, lesson.path, lesson.path_extra, db_session)
+        if plan.first_exam_index is not None:
+            path = ".".join(map(str, plan.path[plan.first_exam_index :]))
 
     session = Session(
         user_id=user_id,
@@ -123,7 +127,7 @@ async def lesson_start_from_callback_processing(
         session = await prepare_session(lesson, db_session, attr, user.id)
 
     await show_slides(callback.message, state, session, db_session)
-    await state.update_data(session_id=session.id)
+    await save_session(state, session, db_session)
 
 
 @router.callback_query(RemindersCallbackFactory.filter())
@@ -155,7 +159,7 @@ async def reminders_callback_processing(
     await set_user_reminders(
         user_id=user.id, reminder_freq=frequency if frequency > 0 else None, db_session=db_session
     )
-    await db_session.commit()
+    await commit_and_invalidate(db_session, CacheScope.USERS, user.telegram_id)
     await callback.message.answer(text=message)
     # TODO: вот тут нужен правильный флаг, чтобы после команды не показывать старт меню
     await show_start_menu(event=callback.message, user_id=user.id, db_session=db_session)
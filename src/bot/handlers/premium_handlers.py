@@ -16,8 +16,9 @@ from bot.keyboards.keyboards import get_lesson_picker_keyboard
 from config import get_settings
 from database.crud.answer import get_text_by_prompt
 from database.crud.lesson import get_active_lessons, get_completed_lessons_from_sessions
+from database.invalidation import commit_and_invalidate
 from database.models.user import User
-from enums import SubscriptionType, SubscriptionDuration, UserSubscriptionType
+from enums import CacheScope, SubscriptionType, SubscriptionDuration, UserSubscriptionType
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,7 @@ async def on_successful_payment(
         new_expiry = today + relativedelta(months=months)
     user.subscription_status = UserSubscriptionType.LIMITED_ACCESS
     user.subscription_expired_at = new_expiry
+    await commit_and_invalidate(db_session, CacheScope.USERS, user.telegram_id)
     text = await get_text_by_prompt(prompt=prompt, db_session=db_session)
     await message.answer(text)
     logger.info(f"Successful payment for user {user.username}: {message.successful_payment.invoice_payload}")
@@ -0,0 +1,24 @@
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.enums import ParseMode
+from redis.asyncio import Redis
+
+from bot.internal.rate_limiter import RateLimiterMiddleware, TelegramRateLimiter
+from config import Settings
+
+
+def create_bot(settings: Settings, redis: Redis | None = None) -> Bot:
+    session = None
+    if settings.TELEGRAM_API_URL:
+        # Lets the bot talk to a local Bot API server or a fake one in tests.
+        session = AiohttpSession(api=TelegramAPIServer.from_base(settings.TELEGRAM_API_URL))
+    bot = Bot(
+        token=settings.BOT_TOKEN.get_secret_value(),
+        session=session,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    if redis is not None:
+        bot.session.middleware(RateLimiterMiddleware(TelegramRateLimiter(redis, settings.STAGE)))
+    return bot
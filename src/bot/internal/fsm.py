@@ -0,0 +1,87 @@
+from collections import Counter
+from collections.abc import Mapping
+from copy import deepcopy
+from typing import Any
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+
+class CountingStorage(BaseStorage):
+    # Every call below is a single Redis command in RedisStorage.
+    def __init__(self, storage: BaseStorage) -> None:
+        self.storage = storage
+        self.commands: Counter[str] = Counter()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        self.commands["set_state"] += 1
+        await self.storage.set_state(key=key, state=state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        self.commands["get_state"] += 1
+        return await self.storage.get_state(key=key)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        self.commands["set_data"] += 1
+        await self.storage.set_data(key=key, data=data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        self.commands["get_data"] += 1
+        return await self.storage.get_data(key=key)
+
+    async def close(self) -> None:
+        await self.storage.close()
+
+
+class BufferedFSMContext(FSMContext):
+    # Reads the storage at most once per update; everything is written back in one go by commit().
+    def __init__(self, context: FSMContext, *, raw_state: str | None = None, state_loaded: bool = False) -> None:
+        super().__init__(storage=context.storage, key=context.key)
+        self._state = raw_state
+        self._state_loaded = state_loaded
+        self._state_changed = False
+        self._data: dict[str, Any] | None = None
+        self._data_changed = False
+
+    async def set_state(self, state: StateType = None) -> None:
+        self._state = state.state if isinstance(state, State) else state
+        self._state_loaded = True
+        self._state_changed = True
+
+    async def get_state(self) -> str | None:
+        if not self._state_loaded:
+            self._state = await self.storage.get_state(key=self.key)
+            self._state_loaded = True
+        return self._state
+
+    async def _load_data(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = await self.storage.get_data(key=self.key)
+        return self._data
+
+    async def set_data(self, data: Mapping[str, Any]) -> None:
+        self._data = deepcopy(dict(data))
+        self._data_changed = True
+
+    async def get_data(self) -> dict[str, Any]:
+        return deepcopy(await self._load_data())
+
+    async def get_value(self, key: str, default: Any | None = None) -> Any | None:
+        return deepcopy((await self._load_data()).get(key, default))
+
+    async def update_data(self, data: Mapping[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        if data:
+            kwargs.update(data)
+        current_data = await self._load_data()
+        current_data.update(deepcopy(kwargs))
+        self._data_changed = True
+        return deepcopy(current_data)
+
+    async def commit(self) -> None:
+        if self._state_changed:
+            await self.storage.set_state(key=self.key, state=self._state)
+            self._state_changed = False
+        if self._data_changed:
+            await self.storage.set_data(key=self.key, data=self._data)
+            self._data_changed = False
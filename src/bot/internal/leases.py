@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from consts import USER_LEASE_TTL_MS
+from enums import Stage
+
+logger = logging.getLogger(__name__)
+
+# Only the holder of the token may extend or drop the lease, so an expired lease never frees someone else's.
+EXTEND_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_redis: Redis | None = None
+_prefix = "english_buddy_bot:lease"
+# Fallback for a single process without Redis (tests, local runs).
+_local_leases: set[str] = set()
+
+
+def setup_user_leases(redis: Redis, stage: Stage) -> None:
+    global _redis, _prefix
+    _redis = redis
+    _prefix = f"english_buddy_bot:{stage.value}:lease"
+
+
+async def _keep_alive(key: str, token: str, ttl_ms: int) -> None:
+    while True:
+        await asyncio.sleep(ttl_ms / 3000)
+        if not await _redis.eval(EXTEND_SCRIPT, 1, key, token, ttl_ms):
+            logger.warning(f"Lease {key} was lost before it could be extended")
+            return
+
+
+@asynccontextmanager
+async def user_lease(user_id: int, ttl_ms: int = USER_LEASE_TTL_MS) -> AsyncIterator[bool]:
+    key = f"{_prefix}:user:{user_id}"
+    if _redis is None:
+        if key in _local_leases:
+            yield False
+            return
+        _local_leases.add(key)
+        try:
+            yield True
+        finally:
+            _local_leases.discard(key)
+        return
+
+    token = uuid4().hex
+    if not await _redis.set(key, token, nx=True, px=ttl_ms):
+        yield False
+        return
+    keep_alive = asyncio.create_task(_keep_alive(key, token, ttl_ms))
+    try:
+        yield True
+    finally:
+        # Neither a failed keep-alive nor a failed release may replace the handler's own outcome.
+        keep_alive.cancel()
+        try:
+            await keep_alive
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception(f"Lease {key} could not be kept alive")
+        try:
+            await _redis.eval(RELEASE_SCRIPT, 1, key, token)
+        except Exception:
+            logger.exception(f"Lease {key} could not be released, it expires in {ttl_ms} ms")
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    CopyMessage,
+    CopyMessages,
+    ForwardMessage,
+    ForwardMessages,
+    Response,
+    SendAnimation,
+    SendAudio,
+    SendContact,
+    SendDice,
+    SendDocument,
+    SendInvoice,
+    SendLocation,
+    SendMediaGroup,
+    SendMessage,
+    SendPhoto,
+    SendPoll,
+    SendSticker,
+    SendVenue,
+    SendVideo,
+    SendVideoNote,
+    SendVoice,
+    TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+from redis.asyncio import Redis
+
+from consts import TELEGRAM_CHAT_BURST, TELEGRAM_CHAT_RATE, TELEGRAM_GLOBAL_RATE, TELEGRAM_RETRY_ATTEMPTS
+from enums import Stage
+
+logger = logging.getLogger(__name__)
+
+# Token buckets refilled by Redis time, so every process shares them: one for the whole bot and, when a chat key
+# is given, one for that chat. Telegram's RetryAfter pauses are honoured for the whole bot and for the chat.
+# Tokens are stored in thousandths. Returns 0 when a token was taken, otherwise the milliseconds to wait.
+ACQUIRE_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local pause = redis.call("PTTL", KEYS[2])
+if KEYS[4] then
+    pause = math.max(pause, redis.call("PTTL", KEYS[4]))
+end
+if pause > 0 then
+    return pause
+end
+
+local function refill(key, rate, burst)
+    local state = redis.call("HMGET", key, "tokens", "ts")
+    local tokens = tonumber(state[1]) or burst * 1000
+    local ts = tonumber(state[2]) or now
+    return math.min(burst * 1000, tokens + (now - ts) * rate)
+end
+
+local function take(key, tokens)
+    redis.call("HSET", key, "tokens", tokens - 1000, "ts", now)
+    redis.call("PEXPIRE", key, 60000)
+end
+
+local global_rate, global_burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local global_tokens = refill(KEYS[1], global_rate, global_burst)
+local wait = 0
+if global_tokens < 1000 then
+    wait = math.ceil((1000 - global_tokens) / global_rate)
+end
+if not KEYS[3] then
+    if wait == 0 then
+        take(KEYS[1], global_tokens)
+    end
+    return wait
+end
+
+local chat_rate, chat_burst = tonumber(ARGV[3]), tonumber(ARGV[4])
+local chat_tokens = refill(KEYS[3], chat_rate, chat_burst)
+if chat_tokens < 1000 then
+    wait = math.max(wait, math.ceil((1000 - chat_tokens) / chat_rate))
+end
+if wait == 0 then
+    take(KEYS[1], global_tokens)
+    take(KEYS[3], chat_tokens)
+end
+return wait
+"""
+
+# Telegram's one-message-per-second chat limit counts new messages only; edits, deletions and chat actions
+# are charged against the bot-wide bucket alone.
+MESSAGE_METHODS = (
+    SendMessage,
+    SendPhoto,
+    SendAnimation,
+    SendAudio,
+    SendDocument,
+    SendSticker,
+    SendVideo,
+    SendVideoNote,
+    SendVoice,
+    SendMediaGroup,
+    SendLocation,
+    SendVenue,
+    SendContact,
+    SendPoll,
+    SendDice,
+    SendInvoice,
+    CopyMessage,
+    CopyMessages,
+    ForwardMessage,
+    ForwardMessages,
+)
+
+
+class TelegramRateLimiter:
+    def __init__(
+        self,
+        redis: Redis,
+        stage: Stage,
+        global_rate: int = TELEGRAM_GLOBAL_RATE,
+        chat_rate: int = TELEGRAM_CHAT_RATE,
+        chat_burst: int = TELEGRAM_CHAT_BURST,
+    ) -> None:
+        self.redis = redis
+        self.prefix = f"english_buddy_bot:{stage.value}:ratelimit"
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+
+    async def try_acquire(self, chat_id: int | str | None = None) -> int:
+        keys = [f"{self.prefix}:global", f"{self.prefix}:pause"]
+        if chat_id is not None:
+            keys += [f"{self.prefix}:chat:{chat_id}", f"{self.prefix}:pause:{chat_id}"]
+        args = [self.global_rate, self.global_rate, self.chat_rate, self.chat_burst]
+        return await self.redis.eval(ACQUIRE_SCRIPT, len(keys), *keys, *args)
+
+    async def acquire(self, chat_id: int | str | None = None) -> None:
+        while wait_ms := await self.try_acquire(chat_id):
+            await asyncio.sleep(wait_ms / 1000)
+
+    async def pause(self, chat_id: int | str, seconds: int) -> None:
+        # Telegram does not say whether a flood wait is for the chat or the whole bot, so both wait it out.
+        px = max(1, seconds * 1000)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"{self.prefix}:pause", 1, px=px)
+            pipe.set(f"{self.prefix}:pause:{chat_id}", 1, px=px)
+            await pipe.execute()
+
+
+class RateLimiterMiddleware(BaseRequestMiddleware):
+    def __init__(self, limiter: TelegramRateLimiter, attempts: int = TELEGRAM_RETRY_ATTEMPTS) -> None:
+        self.limiter = limiter
+        self.attempts = attempts
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        # Only requests addressed to a chat count against Telegram's message limits.
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+        for attempt in range(1, self.attempts + 1):
+            await self.limiter.acquire(chat_id if isinstance(method, MESSAGE_METHODS) else None)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as exc:
+                if attempt == self.attempts:
+                    raise
+                logger.warning(f"Flood control for chat {chat_id}, retrying in {exc.retry_after}s")
+                await self.limiter.pause(chat_id, exc.retry_after)
@@ -5,6 +5,7 @@ from aiogram.types import Message
 
 from config import get_settings
 from database.crud.user import add_user_to_db, get_user_from_db_by_tg_id
+from database.user_cache import user_cache
 
 settings = get_settings()
 
@@ -17,14 +18,17 @@ class AuthMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         session = data["db_session"]
-        user = await get_user_from_db_by_tg_id(event.from_user.id, session)
         data["is_new_user"] = False
-        if not user:
-            user = await add_user_to_db(event.from_user, session)
-            await session.commit()
-            data["is_new_user"] = True
-            # if settings.STAGE == Stage.PROD:
-            #     await blink1_green()
-            #     await sheet_update('C3', user.id)
+        user = user_cache.get(event.from_user.id, session)
+        if user is None:
+            user = await get_user_from_db_by_tg_id(event.from_user.id, session)
+            if not user:
+                user = await add_user_to_db(event.from_user, session)
+                await session.commit()
+                data["is_new_user"] = True
+                # if settings.STAGE == Stage.PROD:
+                #     await blink1_green()
+                #     await sheet_update('C3', user.id)
+            user_cache.put(user)
         data["user"] = user
         return await handler(event, data)
@@ -0,0 +1,25 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+
+from bot.internal.fsm import BufferedFSMContext
+
+
+class FSMBufferMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any],
+    ) -> Any:
+        state = data.get("state")
+        if state is None:
+            return await handler(event, data)
+        state = BufferedFSMContext(state, raw_state=data.get("raw_state"), state_loaded="raw_state" in data)
+        data["state"] = state
+        try:
+            return await handler(event, data)
+        finally:
+            # Written even when the handler fails, as the unbuffered context would have done.
+            await state.commit()
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict
 from aiogram import BaseMiddleware
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import CallbackQuery, Message
+from bot.controllers.session_controllers import drop_session_snapshot, restore_session, save_session
 from database.crud.session import get_last_session_with_progress, get_session
 from database.database_connector import DatabaseConnector
 from sqlalchemy.exc import PendingRollbackError
@@ -25,18 +26,21 @@ class DBSessionMiddleware(BaseMiddleware):
         event: Message,
         data: Dict[str, Any],
     ) -> Any:
+        # AsyncSession checks a connection out of the pool only on its first statement,
+        # so handlers that never touch the database cost neither a checkout nor a COMMIT.
         async with self.db.session_factory() as db_session:
-            # TODO: mb change to db_session factory
             data["db_session"] = db_session
             try:
                 res = await handler(event, data)
             except Exception:
-                with suppress(PendingRollbackError):
-                    await db_session.rollback()
+                if db_session.in_transaction():
+                    with suppress(PendingRollbackError):
+                        await db_session.rollback()
                 raise
             else:
-                with suppress(PendingRollbackError):
-                    await db_session.commit()
+                if db_session.in_transaction():
+                    with suppress(PendingRollbackError):
+                        await db_session.commit()
                 return res
 
 
@@ -52,19 +56,25 @@ class SessionMiddleware(BaseMiddleware):
         session_id = state_data.get("session_id")
         db_session: AsyncSession = data["db_session"]
 
-        if session_id is not None:
+        user_session = restore_session(state_data, db_session)
+        if user_session is None and session_id is not None:
             user_session = await get_session(session_id, db_session)
             if not user_session or user_session.status != SessionStatus.IN_PROGRESS:
                 await self._handle_missing_session(event, state)
                 return
-        else:
+        elif user_session is None:
             user_session = await self._recover_session_from_db(data, db_session, state)
             if not user_session:
                 await self._handle_missing_session(event, state)
                 return
 
         data["session"] = user_session
-        return await handler(event, data)
+        result = await handler(event, data)
+        if user_session.status == SessionStatus.IN_PROGRESS:
+            await save_session(state, user_session, db_session)
+        else:
+            await drop_session_snapshot(state)
+        return result
 
     @staticmethod
     async def _recover_session_from_db(
@@ -0,0 +1,92 @@
+import asyncio
+import logging.config
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from aiogram import Dispatcher
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import SimpleEventIsolation
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+from redis.asyncio import Redis
+import sentry_sdk
+
+from bot.handlers.command_handlers import router as base_router
+from bot.handlers.errors_handler import router as errors_router
+from bot.handlers.lesson_handlers import router as lesson_router
+from bot.handlers.premium_handlers import router as premium_router
+from bot.handlers.session_handlers import router as quiz_router
+from bot.internal.fsm import CountingStorage
+from bot.internal.leases import setup_user_leases
+from bot.middlewares.auth_middleware import AuthMiddleware
+from bot.middlewares.fsm_middleware import FSMBufferMiddleware
+from bot.middlewares.session_middlewares import DBSessionMiddleware
+from bot.middlewares.updates_dumper_middleware import UpdatesDumperMiddleware
+from config import Settings, get_logging_config, get_settings
+from database.database_connector import DatabaseConnector
+from database.invalidation import get_invalidation_channel, listen_for_invalidations
+from database.quiz_answer_buffer import quiz_answer_log_buffer
+from database.user_cache import user_cache
+from enums import Stage
+
+
+def setup_process(app_name: str) -> Settings:
+    logs_directory = Path("logs")
+    logs_directory.mkdir(parents=True, exist_ok=True)
+    logging_config = get_logging_config(app_name)
+    logging.config.dictConfig(logging_config)
+    settings = get_settings()
+
+    if settings.SENTRY_AIOGRAM_DSN and settings.STAGE == Stage.PROD:
+        sentry_sdk.init(
+            dsn=settings.SENTRY_AIOGRAM_DSN.get_secret_value(),
+            # Set traces_sample_rate to 1.0 to capture 100%
+            # of transactions for performance monitoring.
+            traces_sample_rate=1.0,
+            # Set profiles_sample_rate to 1.0 to profile 100%
+            # of sampled transactions.
+            # We recommend adjusting this value in production.
+            profiles_sample_rate=1.0,
+        )
+    return settings
+
+
+def create_storage(settings: Settings, redis: Redis) -> CountingStorage:
+    return CountingStorage(
+        RedisStorage(
+            redis,
+            key_builder=DefaultKeyBuilder(prefix=f"english_buddy_bot:{settings.STAGE.value}"),
+        )
+    )
+
+
+def build_dispatcher(storage: BaseStorage, db: DatabaseConnector) -> Dispatcher:
+    dispatcher = Dispatcher(storage=storage, events_isolation=SimpleEventIsolation())
+    fsm_buffer_middleware = FSMBufferMiddleware()
+    dispatcher.message.middleware(fsm_buffer_middleware)
+    dispatcher.callback_query.middleware(fsm_buffer_middleware)
+    db_session_middleware = DBSessionMiddleware(db)
+    dispatcher.message.middleware(db_session_middleware)
+    dispatcher.callback_query.middleware(db_session_middleware)
+    dispatcher.message.middleware(AuthMiddleware())
+    dispatcher.callback_query.middleware(AuthMiddleware())
+    dispatcher.update.outer_middleware(UpdatesDumperMiddleware())
+    dispatcher.include_routers(base_router, errors_router, lesson_router, quiz_router, premium_router)
+    return dispatcher
+
+
+@asynccontextmanager
+async def run_bot_services(settings: Settings, redis: Redis, db: DatabaseConnector) -> AsyncIterator[None]:
+    # Per-process machinery every update-handling process needs, whether it polls or reads the update stream.
+    setup_user_leases(redis, settings.STAGE)
+    invalidation_listener = asyncio.create_task(
+        listen_for_invalidations(redis, get_invalidation_channel(settings.STAGE)),
+    )
+    quiz_answer_log_buffer.start(db)
+    try:
+        yield
+    finally:
+        invalidation_listener.cancel()
+        await quiz_answer_log_buffer.stop()
+        logging.info(f"quiz answer buffer: {quiz_answer_log_buffer.dropped} answers dropped")
+        logging.info(f"user cache: {user_cache.hits} hits, {user_cache.misses} misses")
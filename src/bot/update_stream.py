@@ -0,0 +1,116 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from enums import Stage
+
+logger = logging.getLogger(__name__)
+
+UPDATE_STREAM_GROUP = "bot"
+UPDATE_STREAM_MAXLEN = 100_000
+UPDATE_STREAM_BATCH = 100
+UPDATE_STREAM_BLOCK_MS = 5000
+UPDATE_STREAM_CONCURRENCY = 100
+
+
+def get_update_stream(stage: Stage, partition: int) -> str:
+    return f"english_buddy_bot:{stage.value}:updates:{partition}"
+
+
+def get_update_owner(update: dict[str, Any]) -> int:
+    # Updates with the same owner are handled strictly in order; different owners never wait for each other.
+    for event in update.values():
+        if not isinstance(event, dict):
+            continue
+        if "from" in event:
+            return event["from"]["id"]
+        if "chat" in event:
+            return event["chat"]["id"]
+    return update["update_id"]
+
+
+def get_partition(update: dict[str, Any], partitions: int) -> int:
+    # Everything one user does lands in the same partition, so one consumer sees all of it.
+    return get_update_owner(update) % partitions
+
+
+async def publish_update(redis: Redis, stage: Stage, partitions: int, update: dict[str, Any]) -> None:
+    await redis.xadd(
+        get_update_stream(stage, get_partition(update, partitions)),
+        {"update": json.dumps(update)},
+        maxlen=UPDATE_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+async def consume_updates(
+    redis: Redis,
+    stream: str,
+    bot: Bot,
+    dispatcher: Dispatcher,
+    concurrency: int = UPDATE_STREAM_CONCURRENCY,
+) -> None:
+    try:
+        await redis.xgroup_create(stream, UPDATE_STREAM_GROUP, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+    consumer = stream.rsplit(":", 1)[-1]
+    # Handlers sleep (slide delays, rate limits), so each owner gets its own queue and a slow one holds
+    # back only itself. At most `concurrency` entries are read but not yet acked.
+    slots = asyncio.Semaphore(concurrency)
+    queues: dict[int, deque[tuple[bytes, dict[str, Any]]]] = {}
+
+    async def handle_owner(owner: int) -> None:
+        queue = queues[owner]
+        while queue:
+            entry_id, update = queue[0]
+            try:
+                await dispatcher.feed_raw_update(bot, update)
+            except Exception:
+                logger.exception(f"Failed to process update {entry_id} from {stream}")
+            try:
+                await redis.xack(stream, UPDATE_STREAM_GROUP, entry_id)
+            except Exception:
+                logger.exception(f"Failed to ack update {entry_id} from {stream}, it will be delivered again")
+            queue.popleft()
+            slots.release()
+        del queues[owner]
+
+    # Entries delivered before a crash but never acked come first, then new ones.
+    last_id = "0"
+    async with asyncio.TaskGroup() as task_group:
+        while True:
+            response = await redis.xreadgroup(
+                UPDATE_STREAM_GROUP,
+                consumer,
+                {stream: last_id},
+                count=UPDATE_STREAM_BATCH,
+                block=UPDATE_STREAM_BLOCK_MS,
+            )
+            entries = response[0][1] if response else []
+            if last_id != ">" and not entries:
+                last_id = ">"
+                continue
+            for entry_id, fields in entries:
+                if last_id != ">":
+                    last_id = entry_id
+                try:
+                    update = json.loads(fields[b"update"])
+                    owner = get_update_owner(update)
+                except Exception:
+                    logger.exception(f"Dropping malformed update {entry_id} from {stream}")
+                    await redis.xack(stream, UPDATE_STREAM_GROUP, entry_id)
+                    continue
+                await slots.acquire()
+                if owner in queues:
+                    queues[owner].append((entry_id, update))
+                else:
+                    queues[owner] = deque([(entry_id, update)])
+                    task_group.create_task(handle_owner(owner))
@@ -0,0 +1,48 @@
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Annotated
+
+from aiogram import Bot
+from fastapi import FastAPI, Header, Request, Response, status
+from redis.asyncio import Redis
+
+from bot.update_stream import publish_update
+from config import Settings
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_PATH = "/telegram/webhook"
+
+
+def create_webhook_app(
+    settings: Settings,
+    redis: Redis,
+    bot: Bot | None = None,
+    allowed_updates: list[str] | None = None,
+) -> FastAPI:
+    # Updates are only queued here; the stream workers run the dispatcher.
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        if bot is not None and settings.WEBHOOK_URL:
+            await bot.set_webhook(
+                url=settings.WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH,
+                secret_token=settings.WEBHOOK_SECRET.get_secret_value() if settings.WEBHOOK_SECRET else None,
+                allowed_updates=allowed_updates,
+            )
+            logger.info(f"webhook set to {settings.WEBHOOK_URL}")
+        yield
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post(WEBHOOK_PATH)
+    async def telegram_webhook(
+        request: Request,
+        x_telegram_bot_api_secret_token: Annotated[str | None, Header()] = None,
+    ) -> Response:
+        if settings.WEBHOOK_SECRET and x_telegram_bot_api_secret_token != settings.WEBHOOK_SECRET.get_secret_value():
+            return Response(status_code=status.HTTP_403_FORBIDDEN)
+        await publish_update(redis, settings.STAGE, settings.UPDATE_STREAM_PARTITIONS, await request.json())
+        return Response()
+
+    return app
@@ -20,6 +20,10 @@ class Settings(BaseSettings):
     db_echo: bool = False
     REDIS_URL: str
     TASKIQ_REDIS_URL: str
+    TELEGRAM_API_URL: str | None = None
+    WEBHOOK_URL: str | None = None
+    WEBHOOK_SECRET: SecretStr | None = None
+    UPDATE_STREAM_PARTITIONS: int = 8
     allowed_image_formats: list[str] = ["png", "jpg", "jpeg", "gif", "heic", "tiff", "webp"]
 
     @property
@@ -3,3 +3,17 @@ IMAGE_WIDTH = 800
 UTC_STARTING_MARK = 14
 ONE_HOUR = 3600
 ONE_DAY = 86400
+STATIC_CONTENT_CACHE_TTL = 600
+SESSION_SNAPSHOT_TTL = 600
+USER_LEASE_TTL_MS = 30_000
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_CHAT_RATE = 1
+TELEGRAM_CHAT_BURST = 5
+TELEGRAM_RETRY_ATTEMPTS = 3
+NEWSLETTER_CONCURRENCY = 10
+REMINDER_CONCURRENCY = 30
+REMINDER_UPDATE_BATCH = 1000
+REMINDER_PAGE_SIZE = 1000
+REMINDER_SHARD_SIZE = 5000
+REMINDER_SHARD_RETRIES = 3
+TOP_BAD_SLIDES_MIN_ATTEMPTS = 5
@@ -1,35 +1,90 @@
-from sqlalchemy import func, select
+from collections import OrderedDict
+import random
+from time import monotonic
+
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from consts import STATIC_CONTENT_CACHE_TTL
+from database.invalidation import register_invalidation_handler
 from database.models.reaction import Reaction
 from database.models.sticker import Sticker
 from database.models.text import Text
-from enums import ReactionType, StickerType
+from enums import CacheScope, ReactionType, StickerType
+
+REACTION_POOLS_LIMIT = 10_000
+
+reactions_by_type: dict[ReactionType, tuple[str, ...]] = {}
+reactions_loaded_at: float | None = None
+reaction_pools: OrderedDict[tuple[int | None, ReactionType], list[str]] = OrderedDict()
+
+sticker_ids_by_type: dict[StickerType, tuple[str, ...]] = {}
+stickers_loaded_at: float | None = None
+
+texts_by_prompt: dict[str, str] = {}
+texts_loaded_at: float | None = None
+
+
+def invalidate_texts_cache(_key: str | None = None) -> None:
+    global texts_loaded_at
+    texts_loaded_at = None
+
+
+def invalidate_reactions_cache(_key: str | None = None) -> None:
+    global reactions_loaded_at
+    reactions_loaded_at = None
+    reaction_pools.clear()
+
+
+register_invalidation_handler(CacheScope.TEXTS, invalidate_texts_cache)
+register_invalidation_handler(CacheScope.REACTIONS, invalidate_reactions_cache)
+
 
-reaction_dict = {
-    ReactionType.RIGHT: set(),
-    ReactionType.WRONG: set(),
-}
+async def get_reactions(db_session: AsyncSession) -> dict[ReactionType, tuple[str, ...]]:
+    global reactions_by_type, reactions_loaded_at
+    if reactions_loaded_at is None or monotonic() - reactions_loaded_at > STATIC_CONTENT_CACHE_TTL:
+        result = await db_session.execute(select(Reaction.type, Reaction.text).order_by(Reaction.id))
+        loaded = {reaction_type: [] for reaction_type in ReactionType}
+        for reaction_type, text in result.tuples():
+            loaded[reaction_type].append(text)
+        reactions_by_type = {reaction_type: tuple(texts) for reaction_type, texts in loaded.items()}
+        reactions_loaded_at = monotonic()
+        reaction_pools.clear()
+    return reactions_by_type
 
 
-async def get_random_answer(mode: ReactionType, db_session: AsyncSession) -> str:
-    if not reaction_dict[mode]:
-        query = select(Reaction.text).filter(Reaction.type == mode)
-        result = await db_session.execute(query)
-        reaction_dict[mode].update(result.scalars().all())
-    return reaction_dict[mode].pop()
+async def get_random_answer(mode: ReactionType, db_session: AsyncSession, chat_id: int | None = None) -> str:
+    reactions = (await get_reactions(db_session))[mode]
+    key = (chat_id, mode)
+    pool = reaction_pools.pop(key, None) or list(reactions)
+    reaction = pool.pop(random.randrange(len(pool)))
+    if pool:
+        reaction_pools[key] = pool
+        if len(reaction_pools) > REACTION_POOLS_LIMIT:
+            reaction_pools.popitem(last=False)
+    return reaction
 
 
-async def get_random_sticker_id(mode: StickerType, db_session: AsyncSession) -> str:
-    query = select(Sticker.sticker_id).filter(Sticker.sticker_type == mode).order_by(func.random()).limit(1)
-    result = await db_session.execute(query)
-    return result.scalar()
+async def get_random_sticker_id(mode: StickerType, db_session: AsyncSession) -> str | None:
+    global sticker_ids_by_type, stickers_loaded_at
+    if stickers_loaded_at is None or monotonic() - stickers_loaded_at > STATIC_CONTENT_CACHE_TTL:
+        result = await db_session.execute(select(Sticker.sticker_type, Sticker.sticker_id))
+        loaded = {sticker_type: [] for sticker_type in StickerType}
+        for sticker_type, sticker_id in result.tuples():
+            loaded[sticker_type].append(sticker_id)
+        sticker_ids_by_type = {sticker_type: tuple(ids) for sticker_type, ids in loaded.items()}
+        stickers_loaded_at = monotonic()
+    sticker_ids = sticker_ids_by_type[mode]
+    return random.choice(sticker_ids) if sticker_ids else None
 
 
 async def get_text_by_prompt(prompt: str, db_session: AsyncSession) -> str:
-    query = select(Text.text).filter(Text.prompt == prompt)
-    result = await db_session.execute(query)
-    check = result.scalar_one_or_none()
+    global texts_by_prompt, texts_loaded_at
+    if texts_loaded_at is None or monotonic() - texts_loaded_at > STATIC_CONTENT_CACHE_TTL:
+        result = await db_session.execute(select(Text.prompt, Text.text))
+        texts_by_prompt = dict(result.tuples().all())
+        texts_loaded_at = monotonic()
+    check = texts_by_prompt.get(prompt)
     if not check:
         return f'Данные по запросу "{prompt}" отсутствуют в базе.'
     return check
@@ -0,0 +1,67 @@
+from collections.abc import Collection
+from dataclasses import dataclass
+
+from sqlalchemy import and_, case, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models.lesson import Lesson
+from database.models.lesson_slide import LessonSlide
+from database.models.slide import Slide
+from enums import SlidesMenuType
+from lesson_path import LessonPath
+
+
+@dataclass(frozen=True, slots=True)
+class SlideLocation:
+    slide: Slide
+    lesson_title: str
+    source: SlidesMenuType
+    index: int
+
+
+async def replace_lesson_slides(
+    lesson_id: int,
+    kind: SlidesMenuType,
+    path: str | None,
+    db_session: AsyncSession,
+) -> None:
+    await db_session.execute(delete(LessonSlide).filter(LessonSlide.lesson_id == lesson_id, LessonSlide.kind == kind))
+    rows = [
+        {"lesson_id": lesson_id, "kind": kind, "position": position, "slide_id": slide_id}
+        for position, slide_id in enumerate(LessonPath(path).path, start=1)
+    ]
+    if rows:
+        await db_session.execute(insert(LessonSlide), rows)
+
+
+async def sync_lesson_slides(lesson: Lesson, db_session: AsyncSession) -> None:
+    await replace_lesson_slides(lesson.id, SlidesMenuType.REGULAR, lesson.path, db_session)
+    await replace_lesson_slides(lesson.id, SlidesMenuType.EXTRA, lesson.path_extra, db_session)
+
+
+async def get_slide_positions(slide_id: int, db_session: AsyncSession) -> list[LessonSlide]:
+    query = select(LessonSlide).filter(LessonSlide.slide_id == slide_id).order_by(LessonSlide.lesson_id)
+    result = await db_session.execute(query)
+    return list(result.scalars().all())
+
+
+async def get_slide_locations(slide_ids: Collection[int], db_session: AsyncSession) -> dict[int, SlideLocation]:
+    # Only the slide's own lesson counts, and its regular path wins over the extra one.
+    if not slide_ids:
+        return {}
+    query = (
+        select(Slide, Lesson.title, LessonSlide.kind, LessonSlide.position)
+        .join(LessonSlide, and_(LessonSlide.slide_id == Slide.id, LessonSlide.lesson_id == Slide.lesson_id))
+        .join(Lesson, Lesson.id == Slide.lesson_id)
+        .filter(Slide.id.in_(slide_ids))
+        .order_by(
+            Slide.id,
+            case((LessonSlide.kind == SlidesMenuType.REGULAR, 0), else_=1),
+            LessonSlide.position,
+        )
+    )
+    result = await db_session.execute(query)
+    locations = {}
+    for slide, lesson_title, kind, position in result.tuples():
+        locations.setdefault(slide.id, SlideLocation(slide, lesson_title, kind, position))
+    return locations
@@ -1,7 +1,15 @@
-from sqlalchemy import Float, cast, func, select
+from datetime import datetime, timezone
+
+from sqlalchemy import Float, cast, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database.crud.slide_answer_stats import add_slide_answer_stats
+from database.models.lesson import Lesson
+from database.models.lesson_slide import LessonSlide
 from database.models.quiz_answer_log import QuizAnswerLog
+from database.models.slide import Slide
+from database.models.slide_answer_stats import SlideAnswerStats
+from database.quiz_answer_buffer import quiz_answer_log_buffer
 from enums import SlideType
 
 
@@ -12,6 +20,17 @@ async def log_quiz_answer(
     is_correct: bool,
     db_session: AsyncSession,
 ):
+    if quiz_answer_log_buffer.is_running:
+        quiz_answer_log_buffer.add(
+            {
+                "session_id": session_id,
+                "slide_id": slide_id,
+                "slide_type": slide_type,
+                "is_correct": is_correct,
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+        return
     session_log = QuizAnswerLog(
         session_id=session_id,
         slide_id=slide_id,
@@ -20,19 +39,30 @@ async def log_quiz_answer(
     )
     db_session.add(session_log)
     await db_session.flush()
+    await add_slide_answer_stats([{"slide_id": slide_id, "is_correct": is_correct}], db_session)
 
 
-async def get_top_error_slides(session: AsyncSession):
+async def get_top_error_slides(limit: int, min_attempts: int, session: AsyncSession):
+    # Ranked from the per-slide rollup, so the page never scans the answer log itself.
+    attempts = SlideAnswerStats.correct_count + SlideAnswerStats.wrong_count
+    correctness_rate = cast(SlideAnswerStats.correct_count, Float) / attempts
+    in_own_lesson = (
+        select(LessonSlide.id)
+        .filter(LessonSlide.slide_id == Slide.id, LessonSlide.lesson_id == Slide.lesson_id)
+        .exists()
+    )
     query = (
         select(
-            QuizAnswerLog.slide_id.label("slide_id"),
-            func.count().filter(QuizAnswerLog.is_correct).label("correct"),
-            func.count().filter(~QuizAnswerLog.is_correct).label("wrong"),
-            (func.count().filter(QuizAnswerLog.is_correct) / cast(func.count(), Float)).label("correctness_rate"),
+            SlideAnswerStats.slide_id.label("slide_id"),
+            SlideAnswerStats.correct_count.label("correct"),
+            SlideAnswerStats.wrong_count.label("wrong"),
+            correctness_rate.label("correctness_rate"),
         )
-        .group_by(QuizAnswerLog.slide_id)
-        .order_by((func.count().filter(QuizAnswerLog.is_correct) / cast(func.count(), Float)))
+        .join(Slide, Slide.id == SlideAnswerStats.slide_id)
+        .join(Lesson, Lesson.id == Slide.lesson_id)
+        .filter(attempts >= max(min_attempts, 1), in_own_lesson)
+        .order_by(correctness_rate, attempts.desc(), SlideAnswerStats.slide_id)
+        .limit(limit)
     )
     result = await session.execute(query)
-    slides_with_errors = result.fetchall()
-    return slides_with_errors
+    return result.fetchall()
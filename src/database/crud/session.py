@@ -1,8 +1,12 @@
-from sqlalchemy import Result, func, select, update
+from dataclasses import dataclass
+
+from sqlalchemy import Result, case, func, literal_column, null, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database.models.lesson import Lesson
 from database.models.quiz_answer_log import QuizAnswerLog
 from database.models.session import Session
+from database.models.slide import Slide
 from enums import SessionStatus, SlideType
 
 
@@ -10,7 +14,8 @@ async def get_current_session(user_id: int, lesson_id: int, db_session: AsyncSes
     query = select(Session).filter(
         Session.user_id == user_id,
         Session.lesson_id == lesson_id,
-        Session.status == SessionStatus.IN_PROGRESS,
+        # Inlined rather than bound: Postgres generic plans for prepared statements cannot match a partial index.
+        Session.status == literal_column(f"'{SessionStatus.IN_PROGRESS.name}'"),
     )
     result: Result = await db_session.execute(query)
     return result.scalar_one_or_none()
@@ -41,14 +46,17 @@ async def update_session_status(session_id: int, new_status: SessionStatus, db_s
     await db_session.execute(query)
 
 
-async def get_wrong_answers_counter(session_id: int, slide_id: int, db_session: AsyncSession) -> int:
-    query = select(func.count(QuizAnswerLog.id)).filter(
-        QuizAnswerLog.session_id == session_id,
-        QuizAnswerLog.slide_id == slide_id,
-        ~QuizAnswerLog.is_correct,
+async def get_wrong_answers_by_slide(session_id: int, db_session: AsyncSession) -> dict[int, int]:
+    query = (
+        select(QuizAnswerLog.slide_id, func.count())
+        .filter(
+            QuizAnswerLog.session_id == session_id,
+            ~QuizAnswerLog.is_correct,
+        )
+        .group_by(QuizAnswerLog.slide_id)
     )
     result = await db_session.execute(query)
-    return result.scalar()
+    return dict(result.tuples().all())
 
 
 async def get_all_questions_in_session(session_id: int, db_session: AsyncSession) -> set[int]:
@@ -61,20 +69,52 @@ async def get_all_questions_in_session(session_id: int, db_session: AsyncSession
     return set(result.scalars().all()) if result else {}
 
 
-async def get_error_counter_from_slides(session_id, slides_set: set[int], db_session: AsyncSession) -> int:
-    subquery = (
-        select(QuizAnswerLog.slide_id)
+@dataclass(frozen=True, slots=True)
+class SessionReport:
+    lesson: Lesson
+    regular_exercises: int
+    correct_regular_answers: int
+    exam_exercises: int
+    correct_exam_answers: int
+    first_exam_slide_id: int | None
+
+
+async def get_session_report(session: Session, db_session: AsyncSession) -> SessionReport:
+    path = list(session.get_path())
+    all_questions_slide_types = [SlideType.QUIZ_OPTIONS, SlideType.QUIZ_INPUT_WORD, SlideType.QUIZ_INPUT_PHRASE]
+    is_question = Slide.slide_type.in_(all_questions_slide_types)
+    has_errors = (
+        select(QuizAnswerLog.id)
         .filter(
-            QuizAnswerLog.session_id == session_id,
-            QuizAnswerLog.slide_id.in_(slides_set),
+            QuizAnswerLog.session_id == session.id,
+            QuizAnswerLog.slide_id == Slide.id,
             ~QuizAnswerLog.is_correct,
         )
-        .distinct()
+        .exists()
+    )
+    position = case({slide_id: index for index, slide_id in enumerate(path)}, value=Slide.id) if path else null()
+    stats = (
+        select(
+            func.count().filter(is_question & ~Slide.is_exam_slide).label("regular_exercises"),
+            func.count().filter(is_question & ~Slide.is_exam_slide & ~has_errors).label("correct_regular_answers"),
+            func.count().filter(is_question & Slide.is_exam_slide).label("exam_exercises"),
+            func.count().filter(is_question & Slide.is_exam_slide & ~has_errors).label("correct_exam_answers"),
+            func.min(position).filter(Slide.is_exam_slide).label("first_exam_position"),
+        )
+        .filter(Slide.id.in_(path))
         .subquery()
     )
-    query = select(func.count()).select_from(subquery)
+    query = select(Lesson, stats).join(stats, true()).filter(Lesson.id == session.lesson_id)
     result = await db_session.execute(query)
-    return result.scalar()
+    row = result.one()
+    return SessionReport(
+        lesson=row.Lesson,
+        regular_exercises=row.regular_exercises,
+        correct_regular_answers=row.correct_regular_answers,
+        exam_exercises=row.exam_exercises,
+        correct_exam_answers=row.correct_exam_answers,
+        first_exam_slide_id=path[row.first_exam_position] if row.first_exam_position is not None else None,
+    )
 
 
 async def get_sessions_statistics(
@@ -0,0 +1,39 @@
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models.slide_answer_stats import SlideAnswerStats
+
+
+async def add_slide_answer_stats(answers: Iterable[Mapping[str, Any]], db_session: AsyncSession) -> None:
+    correct = Counter()
+    wrong = Counter()
+    for answer in answers:
+        (correct if answer["is_correct"] else wrong)[answer["slide_id"]] += 1
+    rows = [
+        {
+            "slide_id": slide_id,
+            "correct_count": correct[slide_id],
+            "wrong_count": wrong[slide_id],
+            "created_at": datetime.now(timezone.utc),
+        }
+        for slide_id in sorted(correct.keys() | wrong.keys())
+    ]
+    if not rows:
+        return
+    dialect = db_session.get_bind().dialect.name
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    query = insert(SlideAnswerStats).values(rows)
+    query = query.on_conflict_do_update(
+        index_elements=[SlideAnswerStats.slide_id],
+        set_={
+            "correct_count": SlideAnswerStats.correct_count + query.excluded.correct_count,
+            "wrong_count": SlideAnswerStats.wrong_count + query.excluded.wrong_count,
+        },
+    )
+    await db_session.execute(query)
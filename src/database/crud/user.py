@@ -1,6 +1,7 @@
-from datetime import datetime, timedelta, timezone
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, timezone
 
-from sqlalchemy import Result, func, select, update
+from sqlalchemy import Result, and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from consts import UTC_STARTING_MARK
@@ -65,6 +66,63 @@ async def get_all_users_with_reminders(db_session: AsyncSession) -> list[User]:
     return list(result.scalars().all())
 
 
+async def get_reminder_frequencies(db_session: AsyncSession) -> list[int]:
+    query = select(User.reminder_freq).filter(User.reminder_freq.is_not(None)).distinct()
+    result = await db_session.execute(query)
+    return list(result.scalars().all())
+
+
+def _due_for_reminder(reminder_due: datetime, frequencies: Sequence[int]):
+    # A user is due once their last reminder slot is `freq` days behind; with a few distinct frequencies
+    # that is one constant bound per frequency, each a range scan on (reminder_freq, last_reminded_at).
+    return or_(
+        *(
+            and_(User.reminder_freq == freq, User.last_reminded_at < reminder_due - timedelta(days=freq - 1))
+            for freq in frequencies
+        )
+    )
+
+
+async def get_due_reminder_shard_starts(
+    reminder_due: datetime,
+    frequencies: Sequence[int],
+    shard_size: int,
+    db_session: AsyncSession,
+) -> list[int]:
+    if not frequencies:
+        return []
+    numbered = (
+        select(User.id, func.row_number().over(order_by=User.id).label("row_number"))
+        .filter(_due_for_reminder(reminder_due, frequencies))
+        .subquery()
+    )
+    query = select(numbered.c.id).filter((numbered.c.row_number - 1) % shard_size == 0).order_by(numbered.c.id)
+    result = await db_session.execute(query)
+    return list(result.scalars().all())
+
+
+async def get_due_reminder_recipients(
+    reminder_due: datetime,
+    frequencies: Sequence[int],
+    after_id: int,
+    limit: int,
+    db_session: AsyncSession,
+    before_id: int | None = None,
+) -> list[tuple[int, int]]:
+    if not frequencies:
+        return []
+    query = (
+        select(User.id, User.telegram_id)
+        .filter(_due_for_reminder(reminder_due, frequencies), User.id > after_id)
+        .order_by(User.id)
+        .limit(limit)
+    )
+    if before_id is not None:
+        query = query.filter(User.id < before_id)
+    result = await db_session.execute(query)
+    return list(result.tuples().all())
+
+
 async def get_all_users(db_session: AsyncSession) -> list[User]:
     query = select(User)
     result = await db_session.execute(query)
@@ -77,10 +135,38 @@ async def get_all_users_with_active_subscription(db_session: AsyncSession) -> li
     return list(result.scalars().all())
 
 
+async def expire_subscriptions(today: date, db_session: AsyncSession) -> list[int]:
+    query = (
+        update(User)
+        .filter(
+            User.subscription_status == UserSubscriptionType.LIMITED_ACCESS,
+            User.subscription_expired_at <= today,
+        )
+        .values(subscription_status=UserSubscriptionType.ACCESS_EXPIRED)
+        .returning(User.telegram_id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db_session.execute(query)
+    return list(result.scalars().all())
+
+
+async def get_telegram_ids_with_subscription_expiring_on(day: date, db_session: AsyncSession) -> list[int]:
+    query = select(User.telegram_id).filter(
+        User.subscription_status == UserSubscriptionType.LIMITED_ACCESS,
+        User.subscription_expired_at == day,
+    )
+    result = await db_session.execute(query)
+    return list(result.scalars().all())
+
+
 async def update_last_reminded_at(user_id: int, timestamp: datetime, db_session: AsyncSession) -> None:
     await db_session.execute(update(User).filter(User.id == user_id).values(last_reminded_at=timestamp))
 
 
+async def mark_users_reminded(user_ids: Sequence[int], timestamp: datetime, db_session: AsyncSession) -> None:
+    await db_session.execute(update(User).filter(User.id.in_(user_ids)).values(last_reminded_at=timestamp))
+
+
 async def set_subscription_status(
     user_id: int,
     new_status: UserSubscriptionType,
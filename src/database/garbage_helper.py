@@ -1,59 +1,108 @@
-from sqlalchemy import delete, select
-from sqlalchemy.ext.asyncio import AsyncSession
+import logging
 
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Select,
+    Table,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    union,
+)
+from sqlalchemy.orm import InstrumentedAttribute
+
+from database.database_connector import DatabaseConnector
 from database.models.lesson import Lesson
+from database.models.lesson_slide import LessonSlide
 from database.models.session import Session
 from database.models.slide import Slide
 from enums import LessonStatus, SessionStatus
-from lesson_path import LessonPath
-
-
-async def get_set_of_all_slides_in_lessons(db_session: AsyncSession) -> set[int]:
-    set_of_all_slides = set()
-    query = select(Lesson).filter(Lesson.is_active.in_((LessonStatus.ACTIVE, LessonStatus.EDITING)))
-    result = await db_session.execute(query)
-    lessons = result.scalars().all()
-    for lesson in lessons:
-        add_slides_from_paths([lesson.path, lesson.path_extra], set_of_all_slides)
-    return set_of_all_slides
-
-
-async def get_set_of_all_slides_in_active_sessions(db_session: AsyncSession) -> set[int]:
-    set_of_all_slides = set()
-    query = select(Session).filter(Session.status == SessionStatus.IN_PROGRESS)
-    result = await db_session.execute(query)
-    sessions = result.scalars().all()
-    for session in sessions:
-        add_slides_from_paths([session.path, session.path_extra], set_of_all_slides)
-    return set_of_all_slides
-
-
-def add_slides_from_paths(paths, slide_set):
-    for path in paths:
-        if path:
-            lesson_path = LessonPath(path).path
-            slide_set.update(lesson_path)
-
-
-async def delete_disabled_lessons(db_session: AsyncSession):
-    disabled_lessons_query = select(Lesson.id).where(Lesson.is_active == LessonStatus.DISABLED)
-    result = await db_session.execute(disabled_lessons_query)
-    disabled_lesson_ids = result.scalars().all()
-    if not disabled_lesson_ids:
-        return
-    await db_session.execute(delete(Session).where(Session.lesson_id.in_(disabled_lesson_ids)))
-    await db_session.execute(delete(Slide).where(Slide.lesson_id.in_(disabled_lesson_ids)))
-    await db_session.execute(delete(Lesson).where(Lesson.id.in_(disabled_lesson_ids)))
-
-
-async def delete_unused_slides(db_session: AsyncSession):
-    all_slides_in_lessons = await get_set_of_all_slides_in_lessons(db_session)
-    all_slides_in_sessions = await get_set_of_all_slides_in_active_sessions(db_session)
-    active_slides = all_slides_in_lessons | all_slides_in_sessions
-    query = delete(Slide).where(Slide.id.notin_(active_slides))
-    await db_session.execute(query)
-
-
-async def collect_garbage(db_session: AsyncSession):
-    await delete_disabled_lessons(db_session)
-    await delete_unused_slides(db_session)
+
+logger = logging.getLogger(__name__)
+
+GC_DELETE_BATCH_SIZE = 1000
+
+
+def _split_path(model: type[Lesson] | type[Session], path: InstrumentedAttribute, dialect: str) -> Select:
+    if dialect == "postgresql":
+        slide_id = cast(func.unnest(func.string_to_array(path, ".")), Integer)
+        query = select(slide_id.label("slide_id")).select_from(model)
+    else:
+        # SQLite has no string_to_array, but a dotted path is a JSON array once the dots become commas.
+        items = func.json_each(literal("[").concat(func.replace(path, ".", ",")).concat("]")).table_valued("value")
+        query = select(cast(items.c.value, Integer).label("slide_id")).join_from(model, items, true())
+    return query.filter(path.is_not(None), path.not_in(("", "None")))
+
+
+def get_referenced_slide_ids(dialect: str):
+    lessons = Lesson.is_active.in_((LessonStatus.ACTIVE, LessonStatus.EDITING))
+    sessions = Session.status == SessionStatus.IN_PROGRESS
+    return union(
+        _split_path(Lesson, Lesson.path, dialect).filter(lessons),
+        _split_path(Lesson, Lesson.path_extra, dialect).filter(lessons),
+        _split_path(Session, Session.path, dialect).filter(sessions),
+        _split_path(Session, Session.path_extra, dialect).filter(sessions),
+    ).subquery("referenced_slides")
+
+
+async def delete_disabled_lessons(db: DatabaseConnector):
+    disabled_lessons = select(Lesson.id).where(Lesson.is_active == LessonStatus.DISABLED).scalar_subquery()
+    async with db.session_factory.begin() as db_session:
+        await db_session.execute(delete(Session).where(Session.lesson_id.in_(disabled_lessons)))
+        await db_session.execute(delete(Slide).where(Slide.lesson_id.in_(disabled_lessons)))
+        await db_session.execute(delete(LessonSlide).where(LessonSlide.lesson_id.in_(disabled_lessons)))
+        await db_session.execute(delete(Lesson).where(Lesson.id.in_(disabled_lessons)))
+
+
+async def delete_unused_slides(db: DatabaseConnector, batch_size: int = GC_DELETE_BATCH_SIZE) -> int:
+    # Paths are split once into a temp table on one connection; every batch then anti-joins against it
+    # in its own short transaction, so locks are never held on more than `batch_size` slides.
+    referenced = Table(
+        "gc_referenced_slides",
+        MetaData(),
+        Column("slide_id", Integer, primary_key=True),
+        prefixes=["TEMPORARY"],
+    )
+    async with db.engine.connect() as conn:
+        async with conn.begin():
+            # A pooled connection may still carry the table if an earlier run died before dropping it.
+            await conn.run_sync(referenced.drop, checkfirst=True)
+            await conn.run_sync(referenced.create)
+            await conn.execute(
+                insert(referenced).from_select(["slide_id"], get_referenced_slide_ids(db.engine.dialect.name))
+            )
+            # Slides created after the snapshot are not in it, so they are never candidates.
+            last_slide_id = await conn.scalar(select(func.coalesce(func.max(Slide.id), 0)))
+        unused = (
+            select(Slide.id)
+            .outerjoin(referenced, referenced.c.slide_id == Slide.id)
+            .filter(referenced.c.slide_id.is_(None), Slide.id <= last_slide_id)
+            .order_by(Slide.id)
+            .limit(batch_size)
+        )
+        query = delete(Slide).where(Slide.id.in_(unused.scalar_subquery()))
+        deleted = 0
+        try:
+            while True:
+                async with conn.begin():
+                    result = await conn.execute(query)
+                deleted += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+                logger.info("Deleted %s unused slides so far", deleted)
+        finally:
+            async with conn.begin():
+                await conn.run_sync(referenced.drop)
+    logger.info("Garbage collection deleted %s unused slides", deleted)
+    return deleted
+
+
+async def collect_garbage(db: DatabaseConnector):
+    await delete_disabled_lessons(db)
+    await delete_unused_slides(db)
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from enums import CacheScope, Stage
+
+logger = logging.getLogger(__name__)
+
+InvalidationHandler = Callable[[str | None], None]
+
+_handlers: dict[CacheScope, list[InvalidationHandler]] = defaultdict(list)
+_publisher: Redis | None = None
+_channel: str | None = None
+
+
+def get_invalidation_channel(stage: Stage) -> str:
+    return f"english_buddy_bot:{stage.value}:invalidate"
+
+
+def register_invalidation_handler(scope: CacheScope, handler: InvalidationHandler) -> None:
+    _handlers[scope].append(handler)
+
+
+def invalidate_locally(scope: CacheScope, key: str | None = None) -> None:
+    for handler in _handlers[scope]:
+        handler(key)
+
+
+def invalidate_all_locally() -> None:
+    for scope in CacheScope:
+        invalidate_locally(scope)
+
+
+def setup_invalidation_publisher(redis: Redis, channel: str) -> None:
+    global _publisher, _channel
+    _publisher = redis
+    _channel = channel
+
+
+def _encode(scope: CacheScope, key: str | None) -> str:
+    return scope.value if key is None else f"{scope.value}:{key}"
+
+
+def _decode(raw: bytes | str) -> tuple[CacheScope, str | None]:
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    scope, _, key = raw.partition(":")
+    return CacheScope(scope), key or None
+
+
+async def publish_invalidation(scope: CacheScope, key: int | str | None = None) -> None:
+    key = None if key is None else str(key)
+    invalidate_locally(scope, key)
+    if _publisher is None:
+        return
+    try:
+        await _publisher.publish(_channel, _encode(scope, key))
+    except RedisError as exc:
+        logger.warning("Unable to publish %s invalidation (key=%s): %s", scope, key, exc)
+
+
+async def commit_and_invalidate(db_session: AsyncSession, scope: CacheScope, key: int | str | None = None) -> None:
+    # Readers reload right after they get the message, so it must never outrun the commit.
+    await db_session.commit()
+    await publish_invalidation(scope, key)
+
+
+async def listen_for_invalidations(redis: Redis, channel: str) -> None:
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(channel)
+                # Whatever was published while we were not subscribed is lost, so start from a clean slate.
+                invalidate_all_locally()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        scope, key = _decode(message["data"])
+                    except ValueError:
+                        logger.warning("Skipping malformed invalidation message: %r", message["data"])
+                        continue
+                    invalidate_locally(scope, key)
+        except asyncio.CancelledError:
+            raise
+        except (RedisError, OSError) as exc:
+            logger.warning("Invalidation listener disconnected: %s", exc)
+            await asyncio.sleep(1)
@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.crud.slide import get_slides_by_ids
+from database.invalidation import register_invalidation_handler
+from database.models.slide import Slide
+from enums import CacheScope, KeyboardType, SlideType
+from lesson_path import LessonPath
+
+LESSON_PLAN_CACHE_SIZE = 256
+
+LessonPlanKey = tuple[int, str | None, str | None]
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedSlide:
+    id: int
+    lesson_id: int
+    slide_type: SlideType
+    text: str | None
+    picture: str | None
+    delay: float | None
+    keyboard_type: KeyboardType | None
+    keyboard: str | None
+    right_answers: str | None
+    almost_right_answers: str | None
+    almost_right_answer_reply: str | None
+    is_exam_slide: bool
+    right_answers_variants: tuple[str, ...]
+    almost_right_answers_variants: tuple[str, ...]
+    keyboard_variants: tuple[str, ...]
+
+    @classmethod
+    def from_slide(cls, slide: Slide) -> "PlannedSlide":
+        return cls(
+            id=slide.id,
+            lesson_id=slide.lesson_id,
+            slide_type=slide.slide_type,
+            text=slide.text,
+            picture=slide.picture,
+            delay=slide.delay,
+            keyboard_type=slide.keyboard_type,
+            keyboard=slide.keyboard,
+            right_answers=slide.right_answers,
+            almost_right_answers=slide.almost_right_answers,
+            almost_right_answer_reply=slide.almost_right_answer_reply,
+            is_exam_slide=slide.is_exam_slide,
+            right_answers_variants=tuple(slide.right_answers.split("|")) if slide.right_answers is not None else (),
+            almost_right_answers_variants=tuple((slide.almost_right_answers or "").split("|")),
+            keyboard_variants=tuple(slide.keyboard.split("|")) if slide.keyboard is not None else (),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LessonPlan:
+    lesson_id: int
+    path: tuple[int, ...]
+    path_extra: tuple[int, ...]
+    slides: Mapping[int, PlannedSlide]
+    first_exam_index: int | None
+
+    def get_steps(self, in_extra: bool) -> tuple[int, ...]:
+        return self.path_extra if in_extra else self.path
+
+    def get_slide(self, slide_id: int) -> PlannedSlide | None:
+        return self.slides.get(slide_id)
+
+
+class LessonPlanCache:
+    def __init__(self, maxsize: int = LESSON_PLAN_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._plans: OrderedDict[LessonPlanKey, LessonPlan] = OrderedDict()
+
+    def get(self, key: LessonPlanKey) -> LessonPlan | None:
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+        return plan
+
+    def put(self, key: LessonPlanKey, plan: LessonPlan) -> None:
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+
+    def invalidate(self, lesson_id: str | None = None) -> None:
+        if lesson_id is None:
+            self._plans.clear()
+            return
+        for key in [key for key in self._plans if key[0] == int(lesson_id)]:
+            del self._plans[key]
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+lesson_plan_cache = LessonPlanCache()
+register_invalidation_handler(CacheScope.LESSONS, lesson_plan_cache.invalidate)
+
+
+async def compile_lesson_plan(
+    lesson_id: int,
+    path: str | None,
+    path_extra: str | None,
+    db_session: AsyncSession,
+) -> LessonPlan:
+    regular_path = tuple(LessonPath(path).path)
+    extra_path = tuple(LessonPath(path_extra).path)
+    slides = await get_slides_by_ids([*regular_path, *extra_path], db_session)
+    first_exam_index = next(
+        (
+            index
+            for index, slide_id in enumerate(regular_path)
+            if slide_id in slides and slides[slide_id].is_exam_slide
+        ),
+        None,
+    )
+    return LessonPlan(
+        lesson_id=lesson_id,
+        path=regular_path,
+        path_extra=extra_path,
+        slides=MappingProxyType({slide_id: PlannedSlide.from_slide(slide) for slide_id, slide in slides.items()}),
+        first_exam_index=first_exam_index,
+    )
+
+
+async def get_lesson_plan(
+    lesson_id: int,
+    path: str | None,
+    path_extra: str | None,
+    db_session: AsyncSession,
+) -> LessonPlan:
+    key = (lesson_id, path, path_extra)
+    plan = lesson_plan_cache.get(key)
+    if plan is None:
+        plan = await compile_lesson_plan(lesson_id, path, path_extra, db_session)
+        lesson_plan_cache.put(key, plan)
+    return plan
@@ -0,0 +1,20 @@
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.models.base import Base
+from enums import SlidesMenuType
+
+
+class LessonSlide(Base):
+    __tablename__ = "lesson_slides"
+    __table_args__ = (
+        UniqueConstraint("lesson_id", "kind", "position", name="uq_lesson_slides_lesson_kind_position"),
+        Index("ix_lesson_slides_slide_id", "slide_id"),
+    )
+
+    lesson_id: Mapped[int] = mapped_column(ForeignKey("lessons.id", ondelete="CASCADE"))
+    kind: Mapped[SlidesMenuType]
+    # 1-based, like the slide indexes used throughout the admin panel.
+    position: Mapped[int]
+    # Not a foreign key: a path may still point at a slide that no longer exists.
+    slide_id: Mapped[int]
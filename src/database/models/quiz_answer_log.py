@@ -1,11 +1,12 @@
 from database.models.base import Base
 from enums import SlideType
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 
 class QuizAnswerLog(Base):
     __tablename__ = "quiz_answer_logs"
+    __table_args__ = (Index("ix_quiz_answer_logs_session_slide_correct", "session_id", "slide_id", "is_correct"),)
 
     session_id: Mapped[int] = mapped_column(ForeignKey("sessions.id", ondelete="CASCADE"))
     slide_id: Mapped[int] = mapped_column(ForeignKey("slides.id", ondelete="CASCADE"))
@@ -1,6 +1,7 @@
+from array import array
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.models.base import Base
@@ -9,6 +10,16 @@ from enums import SessionStartsFrom, SessionStatus
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_user_status_created", "user_id", "status", "created_at", postgresql_include=["lesson_id"]),
+        Index(
+            "ix_sessions_in_progress_user_lesson",
+            "user_id",
+            "lesson_id",
+            postgresql_where=text("status = 'IN_PROGRESS'"),
+            sqlite_where=text("status = 'IN_PROGRESS'"),
+        ),
+    )
 
     lesson_id: Mapped[int] = mapped_column(ForeignKey("lessons.id", ondelete="CASCADE"))
     path: Mapped[str]
@@ -20,10 +31,14 @@ class Session(Base):
     in_extra: Mapped[bool] = mapped_column(default=False, server_default="0")
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
-    def get_path(self):
-        if self.in_extra:
-            return [int(elem) for elem in self.path_extra.split(".")]
-        return [int(elem) for elem in self.path.split(".")]
+    def get_path(self) -> array:
+        # Parsed once per source string: reassigning path/path_extra or flipping in_extra swaps the source.
+        source = self.path_extra if self.in_extra else self.path
+        parsed = getattr(self, "_parsed_path", None)
+        if parsed is None or parsed[0] is not source:
+            parsed = (source, array("I", map(int, source.split("."))))
+            self._parsed_path = parsed
+        return parsed[1]
 
     # noinspection PyTypeChecker
     def set_extra(self):
@@ -34,7 +49,4 @@ class Session(Base):
         return self.get_path()[self.current_step]
 
     def has_next(self):
-        path = self.get_path()
-        if self.current_step < len(path):
-            return True
-        return False
+        return self.current_step < len(self.get_path())
@@ -0,0 +1,12 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.models.base import Base
+
+
+class SlideAnswerStats(Base):
+    __tablename__ = "slide_answer_stats"
+
+    slide_id: Mapped[int] = mapped_column(ForeignKey("slides.id", ondelete="CASCADE"), unique=True)
+    correct_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    wrong_count: Mapped[int] = mapped_column(default=0, server_default="0")
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.models.base import Base
@@ -9,6 +9,10 @@ from enums import UserSubscriptionType
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_reminder_freq_last_reminded_at", "reminder_freq", "last_reminded_at"),
+        Index("ix_users_subscription_status_expired_at", "subscription_status", "subscription_expired_at"),
+    )
 
     telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False, unique=True)
     fullname: Mapped[str]
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+
+from database.crud.slide_answer_stats import add_slide_answer_stats
+from database.database_connector import DatabaseConnector
+from database.models.quiz_answer_log import QuizAnswerLog
+
+logger = logging.getLogger(__name__)
+
+QUIZ_ANSWER_LOG_BATCH_SIZE = 100
+QUIZ_ANSWER_LOG_FLUSH_INTERVAL = 0.5
+QUIZ_ANSWER_LOG_MAX_ROWS = 10_000
+# Errors that writing the same row again can never fix, e.g. its session or slide was deleted meanwhile.
+PERMANENT_ERRORS = (IntegrityError, DataError)
+
+
+class QuizAnswerLogBuffer:
+    def __init__(
+        self,
+        batch_size: int = QUIZ_ANSWER_LOG_BATCH_SIZE,
+        flush_interval: float = QUIZ_ANSWER_LOG_FLUSH_INTERVAL,
+        max_rows: int = QUIZ_ANSWER_LOG_MAX_ROWS,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.dropped = 0
+        self._db: DatabaseConnector | None = None
+        self._rows: list[dict[str, Any]] = []
+        self._batch_full = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def start(self, db: DatabaseConnector) -> None:
+        self._db = db
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        # Cancelling could hit the loop halfway through writing a batch, so ask it to finish instead.
+        self._stopping.set()
+        self._batch_full.set()
+        await self._task
+        self._task = None
+        await self.flush()
+        if self._rows:
+            raise RuntimeError(f"{len(self._rows)} quiz answers could not be written before shutdown")
+
+    def add(self, row: dict[str, Any]) -> None:
+        if len(self._rows) >= self.max_rows:
+            # The database has been unreachable for a while; answers are statistics, so shed them rather than memory.
+            if not self.dropped % self.max_rows:
+                logger.error("Quiz answer buffer is full, dropping new answers")
+            self.dropped += 1
+            return
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self._batch_full.set()
+
+    def _requeue(self, rows: list[dict[str, Any]]) -> None:
+        self._rows[:0] = rows
+        overflow = len(self._rows) - self.max_rows
+        if overflow > 0:
+            logger.error("Quiz answer buffer is full, dropping %s answers", overflow)
+            del self._rows[self.max_rows :]
+            self.dropped += overflow
+
+    async def flush(self) -> None:
+        # Serialized so a caller never returns while a batch taken by another flush is still in flight.
+        async with self._flush_lock:
+            rows, self._rows = self._rows, []
+            if not rows or self._db is None:
+                self._rows[:0] = rows
+                return
+            try:
+                await self._insert(rows)
+            except PERMANENT_ERRORS:
+                logger.exception("Batch insert of %s quiz answers failed, retrying row by row", len(rows))
+                failed = await self._insert_one_by_one(rows)
+                if failed:
+                    logger.error("Keeping %s quiz answers for the next flush", len(failed))
+                    self._requeue(failed)
+            except SQLAlchemyError:
+                # Nothing about the rows themselves is wrong, so the whole batch waits for the next flush.
+                logger.exception("Batch insert of %s quiz answers failed, keeping them for the next flush", len(rows))
+                self._requeue(rows)
+            except asyncio.CancelledError:
+                # The transaction was rolled back, so the batch goes back in front of anything added meanwhile.
+                self._requeue(rows)
+                raise
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        async with self._db.session_factory.begin() as db_session:
+            await db_session.execute(insert(QuizAnswerLog), rows)
+            await add_slide_answer_stats(rows, db_session)
+
+    async def _insert_one_by_one(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # Returns the rows that still have to be written; rows the database rejects for good are dropped.
+        for index, row in enumerate(rows):
+            try:
+                await self._insert([row])
+            except PERMANENT_ERRORS:
+                logger.exception("Dropping quiz answer %s the database rejected", row)
+                self.dropped += 1
+            except SQLAlchemyError:
+                logger.exception("Unable to write quiz answer %s", row)
+                return rows[index:]
+        return []
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._batch_full.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Unexpected error while flushing quiz answers")
+
+
+quiz_answer_log_buffer = QuizAnswerLogBuffer()
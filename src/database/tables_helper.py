@@ -9,6 +9,9 @@ from database.models.base import Base
 # noinspection PyUnresolvedReferences
 from database.models.lesson import Lesson
 
+# noinspection PyUnresolvedReferences
+from database.models.lesson_slide import LessonSlide
+
 # noinspection PyUnresolvedReferences
 import database.models.quiz_answer_log
 
@@ -24,6 +27,9 @@ import database.models.session
 # noinspection PyUnresolvedReferences
 from database.models.slide import Slide, SlideType
 
+# noinspection PyUnresolvedReferences
+import database.models.slide_answer_stats
+
 # noinspection PyUnresolvedReferences
 import database.models.sticker
 
@@ -35,6 +41,7 @@ import database.models.reminder_text_variant  # noqa: F401
 
 # noinspection PyUnresolvedReferences
 from database.models.user import User
+from enums import SlidesMenuType
 
 
 async def create_or_drop_db(engine: AsyncEngine, create: bool = True):
@@ -52,6 +59,7 @@ async def populate_db(dc: DatabaseConnector):
         session.add(Lesson(title="abacaba", path=f"{target_slide_id}", index=1))
         session.add(User(telegram_id=100500, fullname="Vasya", last_reminded_at=datetime.now(timezone.utc)))
         session.add(Slide(lesson_id=1, slide_type=SlideType.TEXT, id=target_slide_id))
+        session.add(LessonSlide(lesson_id=1, kind=SlidesMenuType.REGULAR, position=1, slide_id=target_slide_id))
         session.add(Reaction(type=ReactionType.WRONG, text="wrong"))
         session.add(Reaction(type=ReactionType.RIGHT, text="right"))
         await session.commit()
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from database.invalidation import register_invalidation_handler
+from database.models.user import User
+from enums import CacheScope
+
+USER_CACHE_TTL = 60
+USER_CACHE_SIZE = 10_000
+
+
+class UserCache:
+    def __init__(self, ttl: float = USER_CACHE_TTL, maxsize: int = USER_CACHE_SIZE) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._users: OrderedDict[int, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, telegram_id: int, db_session: AsyncSession) -> User | None:
+        entry = self._users.get(telegram_id)
+        if entry is None or monotonic() - entry[0] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._users.move_to_end(telegram_id)
+        # Attach a copy as if it had just been loaded, so handler changes are still flushed as UPDATEs.
+        user = User(**entry[1])
+        make_transient_to_detached(user)
+        db_session.add(user)
+        return user
+
+    def put(self, user: User) -> None:
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        self._users[user.telegram_id] = (monotonic(), values)
+        self._users.move_to_end(user.telegram_id)
+        while len(self._users) > self.maxsize:
+            self._users.popitem(last=False)
+
+    def invalidate(self, telegram_id: str | None = None) -> None:
+        if telegram_id is None:
+            self._users.clear()
+            return
+        self._users.pop(int(telegram_id), None)
+
+
+user_cache = UserCache()
+register_invalidation_handler(CacheScope.USERS, user_cache.invalidate)
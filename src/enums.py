@@ -144,6 +144,14 @@ class MoveSlideDirection(StrEnum):
     DOWN = auto()
 
 
+class CacheScope(StrEnum):
+    LESSONS = auto()
+    TEXTS = auto()
+    REACTIONS = auto()
+    USERS = auto()
+    SESSIONS = auto()
+
+
 def sub_status_to_select_one(sub_status: UserSubscriptionType) -> SelectOneEnum:
     match sub_status:
         case UserSubscriptionType.UNLIMITED_ACCESS:
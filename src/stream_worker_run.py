@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+from multiprocessing import Process
+
+from redis.asyncio import Redis
+
+from bot.internal.client import create_bot
+from bot.runtime import build_dispatcher, create_storage, run_bot_services, setup_process
+from bot.update_stream import consume_updates, get_update_stream
+from config import get_settings
+from database.tables_helper import get_db
+
+
+async def main(worker: int, partitions: list[int]) -> None:
+    settings = setup_process(f"stream_worker_{worker}")
+    redis = Redis.from_url(settings.REDIS_URL)
+    bot = create_bot(settings, redis)
+    storage = create_storage(settings, redis)
+    db = get_db()
+    dispatcher = build_dispatcher(storage, db)
+    logging.info(f"stream worker {worker} started, partitions: {partitions}")
+    async with run_bot_services(settings, redis, db):
+        try:
+            await asyncio.gather(
+                *(
+                    consume_updates(redis, get_update_stream(settings.STAGE, partition), bot, dispatcher)
+                    for partition in partitions
+                )
+            )
+        finally:
+            logging.info(f"fsm storage commands: {dict(storage.commands)}")
+            await bot.session.close()
+
+
+def run_worker(worker: int, partitions: list[int]) -> None:
+    asyncio.run(main(worker, partitions))
+
+
+def run_main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Process queued Telegram updates (webhook mode).")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=int(os.getenv("BOT_STREAM_WORKERS", "1")),
+        help="Number of worker processes; partitions are split between them.",
+    )
+    args = parser.parse_args(argv)
+
+    total = get_settings().UPDATE_STREAM_PARTITIONS
+    workers = max(1, min(args.workers, total))
+    if workers == 1:
+        run_worker(0, list(range(total)))
+        return
+    processes = [
+        Process(target=run_worker, args=(worker, list(range(worker, total, workers)))) for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
@@ -1,3 +1,4 @@
+from taskiq import SimpleRetryMiddleware
 from taskiq_redis import RedisStreamBroker
 
 from config import get_settings
@@ -12,4 +13,4 @@ broker = RedisStreamBroker(
     settings.TASKIQ_REDIS_URL,
     queue_name=queue_name,
     consumer_group_name=queue_name,
-)
+).with_middlewares(SimpleRetryMiddleware(default_retry_count=3))
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+from datetime import datetime
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramNotFound
+from aiogram.types import InlineKeyboardMarkup
+from redis.asyncio import Redis
+
+from consts import ONE_DAY, REMINDER_CONCURRENCY, REMINDER_UPDATE_BATCH
+from enums import Stage
+
+logger = logging.getLogger(__name__)
+
+# A retried shard only counts once, and only the shard that completes the run gets the totals back. A shard that
+# ran out of retries counts as finished too, so the run is still reported.
+FINISH_SHARD_SCRIPT = """
+if redis.call("sadd", KEYS[2], ARGV[1]) == 1 then
+    redis.call("hincrby", KEYS[1], "sent", ARGV[2])
+    redis.call("hincrby", KEYS[1], "refused", ARGV[3])
+    redis.call("hincrby", KEYS[1], "failed", ARGV[4])
+    redis.call("hincrby", KEYS[1], "skipped", ARGV[5])
+    redis.call("hincrby", KEYS[1], "exhausted", ARGV[7])
+    redis.call("expire", KEYS[2], ARGV[6])
+end
+if redis.call("scard", KEYS[2]) >= tonumber(redis.call("hget", KEYS[1], "shards") or "0")
+    and redis.call("hsetnx", KEYS[1], "reported", 1) == 1 then
+    return redis.call("hgetall", KEYS[1])
+end
+return nil
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Reminder:
+    user_id: int
+    telegram_id: int
+    text: str
+
+
+@dataclass(slots=True)
+class ReminderStats:
+    sent: int = 0
+    refused: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+class ReminderRun:
+    # Redis bookkeeping for one daily run: who has been sent a reminder and how far the shards got.
+    # A user is claimed as pending before the send and confirmed after it. A pending claim left by an attempt that
+    # died in between is sent again on retry, so delivery is at least once for that narrow window.
+    def __init__(self, redis: Redis, stage: Stage, reminder_due: datetime, ttl: int = 2 * ONE_DAY) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        prefix = f"english_buddy_bot:{stage.value}:reminders:{reminder_due:%Y%m%d%H}"
+        self._deliveries_key = f"{prefix}:deliveries"
+        self._summary_key = f"{prefix}:summary"
+        self._shards_key = f"{prefix}:shards"
+
+    async def start(self, shards: int) -> None:
+        await self.redis.hsetnx(self._summary_key, "shards", shards)
+        await self.redis.expire(self._summary_key, self.ttl)
+
+    async def claim(self, user_id: int) -> bool:
+        # False only when an earlier attempt confirmed the send.
+        if await self.redis.hsetnx(self._deliveries_key, user_id, "pending"):
+            await self.redis.expire(self._deliveries_key, self.ttl)
+            return True
+        return await self.redis.hget(self._deliveries_key, user_id) != b"sent"
+
+    async def confirm(self, user_id: int) -> None:
+        await self.redis.hset(self._deliveries_key, user_id, "sent")
+
+    async def release(self, user_id: int) -> None:
+        await self.redis.hdel(self._deliveries_key, user_id)
+
+    async def finish_shard(self, shard: int, stats: ReminderStats, exhausted: bool = False) -> dict[str, int] | None:
+        summary = await self.redis.eval(
+            FINISH_SHARD_SCRIPT,
+            2,
+            self._summary_key,
+            self._shards_key,
+            shard,
+            stats.sent,
+            stats.refused,
+            stats.failed,
+            stats.skipped,
+            self.ttl,
+            int(exhausted),
+        )
+        if not summary:
+            return None
+        fields = [item.decode() if isinstance(item, bytes) else str(item) for item in summary]
+        return {key: int(value) for key, value in zip(fields[::2], fields[1::2])}
+
+
+async def send_reminders(
+    bot: Bot,
+    reminders: AsyncIterable[Reminder],
+    mark_reminded: Callable[[list[int]], Awaitable[None]],
+    concurrency: int = REMINDER_CONCURRENCY,
+    batch_size: int = REMINDER_UPDATE_BATCH,
+    run: ReminderRun | None = None,
+) -> ReminderStats:
+    # Pacing and RetryAfter are handled by the bot's rate limiter; the pool only bounds requests in flight.
+    stats = ReminderStats()
+    pending = aiter(reminders)
+    pending_lock = asyncio.Lock()
+    reminded: list[int] = []
+
+    async def flush() -> None:
+        batch = reminded[:]
+        reminded.clear()
+        if batch:
+            await mark_reminded(batch)
+
+    async def remember(user_id: int) -> None:
+        reminded.append(user_id)
+        if len(reminded) >= batch_size:
+            await flush()
+
+    async def next_reminder() -> Reminder | None:
+        # Async generators cannot be advanced concurrently, and a page fetch may be in progress.
+        async with pending_lock:
+            return await anext(pending, None)
+
+    async def worker() -> None:
+        while (reminder := await next_reminder()) is not None:
+            if run is not None and not await run.claim(reminder.user_id):
+                # Sent by an earlier attempt of this shard that failed before marking it.
+                stats.skipped += 1
+                await remember(reminder.user_id)
+                continue
+            try:
+                await bot.send_message(chat_id=reminder.telegram_id, text=reminder.text)
+            except (TelegramForbiddenError, TelegramNotFound) as exc:
+                logger.warning("Telegram refused delivery to user %s: %s", reminder.user_id, exc)
+                stats.refused += 1
+            except Exception as send_exc:  # noqa: BLE001
+                logger.exception("Failed to send reminder to user %s", reminder.user_id, exc_info=send_exc)
+                stats.failed += 1
+                if run is not None:
+                    await run.release(reminder.user_id)
+                continue
+            else:
+                stats.sent += 1
+            # Refused deliveries are marked too, so blocked users are not retried every day.
+            if run is not None:
+                await run.confirm(reminder.user_id)
+            await remember(reminder.user_id)
+
+    # If one worker fails (e.g. marking a batch), the others are cancelled before the bot session is closed.
+    async with asyncio.TaskGroup() as task_group:
+        for _ in range(concurrency):
+            task_group.create_task(worker())
+    await flush()
+    return stats
+
+
+async def send_notifications(
+    bot: Bot,
+    telegram_ids: Iterable[int],
+    text: str,
+    reply_markup: InlineKeyboardMarkup | None = None,
+    concurrency: int = REMINDER_CONCURRENCY,
+) -> ReminderStats:
+    stats = ReminderStats()
+    pending = iter(telegram_ids)
+
+    async def worker() -> None:
+        for telegram_id in pending:
+            try:
+                await bot.send_message(chat_id=telegram_id, text=text, reply_markup=reply_markup)
+            except (TelegramForbiddenError, TelegramNotFound) as exc:
+                logger.warning("Telegram refused delivery to %s: %s", telegram_id, exc)
+                stats.refused += 1
+            except Exception as send_exc:  # noqa: BLE001
+                logger.exception("Failed to send notification to %s", telegram_id, exc_info=send_exc)
+                stats.failed += 1
+            else:
+                stats.sent += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats
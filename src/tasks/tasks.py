@@ -1,42 +1,40 @@
 import asyncio
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
 
 from aiogram import Bot
-from aiogram.client.default import DefaultBotProperties
-from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramForbiddenError, TelegramNotFound
+from redis.asyncio import Redis
+from taskiq import Context, TaskiqDepends
 
 from bot.keyboards.keyboards import get_premium_keyboard
+from bot.internal.client import create_bot
 from bot.internal.notify_admin import notify_admin_about_exception
-from bot.controllers.user_controllers import ensure_utc, get_reminder_slot, _pick_reminder_text
+from bot.controllers.user_controllers import get_reminder_slot, _pick_reminder_text
 from config import get_settings
-from consts import UTC_STARTING_MARK
+from consts import REMINDER_PAGE_SIZE, REMINDER_SHARD_RETRIES, REMINDER_SHARD_SIZE, UTC_STARTING_MARK
 from database.crud.answer import get_text_by_prompt
 from database.crud.reminder_text_variant import get_all_reminder_text_variants
 from database.crud.user import (
-    get_all_users_with_active_subscription,
-    get_all_users_with_reminders,
-    set_subscription_status,
-    update_last_reminded_at,
+    expire_subscriptions,
+    get_due_reminder_recipients,
+    get_due_reminder_shard_starts,
+    get_reminder_frequencies,
+    get_telegram_ids_with_subscription_expiring_on,
+    mark_users_reminded,
 )
 from database.garbage_helper import collect_garbage
+from database.invalidation import commit_and_invalidate, get_invalidation_channel, setup_invalidation_publisher
 from database.tables_helper import get_db
-from enums import UserSubscriptionType
+from enums import CacheScope
 from tasks.broker import broker
+from tasks.reminders import Reminder, ReminderRun, ReminderStats, send_notifications, send_reminders
 
 logger = logging.getLogger(__name__)
 db = get_db()
-
-
-async def _update_reminder_timestamp(user_id: int, timestamp: datetime) -> None:
-    async with db.session_factory.begin() as session:
-        await update_last_reminded_at(user_id=user_id, timestamp=timestamp, db_session=session)
-
-
-async def _set_subscription_status(user_id: int, new_status: UserSubscriptionType) -> None:
-    async with db.session_factory.begin() as session:
-        await set_subscription_status(user_id=user_id, new_status=new_status, db_session=session)
+redis = Redis.from_url(get_settings().REDIS_URL)
+setup_invalidation_publisher(redis, get_invalidation_channel(get_settings().STAGE))
 
 
 def _cron_at_starting_mark() -> str:
@@ -49,102 +47,137 @@ async def process_user_reminders() -> None:
     """
     Replacement for the old `check_user_reminders()` loop.
     This task is expected to be triggered by Taskiq scheduler once per day.
+    It only plans the run: due users are split into id ranges, each sent by its own `send_reminder_batch`.
     """
     settings = get_settings()
-    bot = Bot(token=settings.BOT_TOKEN.get_secret_value(), default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    reminder_due = get_reminder_slot(datetime.now(timezone.utc))
+    async with db.session_factory() as session:
+        frequencies = await get_reminder_frequencies(session)
+        shard_starts = await get_due_reminder_shard_starts(reminder_due, frequencies, REMINDER_SHARD_SIZE, session)
+    if not shard_starts:
+        logger.info("No reminders are due at %s", reminder_due)
+        return
+
+    await ReminderRun(redis, settings.STAGE, reminder_due).start(shards=len(shard_starts))
+    shard_ends = [*shard_starts[1:], None]
+    for shard, (first_id, before_id) in enumerate(zip(shard_starts, shard_ends)):
+        await send_reminder_batch.kiq(reminder_due.isoformat(), frequencies, shard, first_id, before_id)
+    logger.info("Planned %s reminder shards for %s", len(shard_starts), reminder_due)
+
+
+@broker.task(retry_on_error=True, max_retries=REMINDER_SHARD_RETRIES)
+async def send_reminder_batch(
+    reminder_due: str,
+    frequencies: list[int],
+    shard: int,
+    first_id: int,
+    before_id: int | None,
+    context: Context = TaskiqDepends(),
+) -> None:
+    settings = get_settings()
+    last_attempt = int(context.message.labels.get("_retries", 0)) + 1 >= REMINDER_SHARD_RETRIES
+    bot = create_bot(settings, redis)
+    due = datetime.fromisoformat(reminder_due)
+    run = ReminderRun(redis, settings.STAGE, due)
     try:
-        utcnow = datetime.now(timezone.utc)
-        reminder_due = get_reminder_slot(utcnow)
-
         async with db.session_factory() as session:
             reminder_text_variants = await get_all_reminder_text_variants(session)
             reminder_text_fallback = None
             if not reminder_text_variants:
                 reminder_text_fallback = await get_text_by_prompt(prompt="reminder_text", db_session=session)
-            users = await get_all_users_with_reminders(session)
-
-        for user in users:
-            if user.reminder_freq is None:
-                continue
-            last_reminded_at = get_reminder_slot(ensure_utc(user.last_reminded_at))
-            if reminder_due - last_reminded_at < timedelta(days=user.reminder_freq):
-                continue
-
-            reminder_text = _pick_reminder_text(reminder_text_variants, reminder_text_fallback)
-            if reminder_text is None:
-                continue
-
-            try:
-                await bot.send_message(chat_id=user.telegram_id, text=reminder_text)
-            except (TelegramForbiddenError, TelegramNotFound) as exc:
-                logger.warning("Telegram refused delivery to %s: %s", user, exc)
-                await _update_reminder_timestamp(user_id=user.id, timestamp=reminder_due)
-            except Exception as send_exc:  # noqa: BLE001
-                logger.exception("Failed to send reminder to %s", user, exc_info=send_exc)
-            else:
-                logger.info("Reminder sent to %s", user)
-                await _update_reminder_timestamp(user_id=user.id, timestamp=reminder_due)
-
-            # Basic throttle to reduce risk of hitting Telegram limits.
-            await asyncio.sleep(0.05)
+
+        async def due_reminders() -> AsyncIterator[Reminder]:
+            # Keyset pages keep memory flat and never hold a connection while messages are being sent.
+            after_id = first_id - 1
+            while True:
+                async with db.session_factory() as session:
+                    recipients = await get_due_reminder_recipients(
+                        due, frequencies, after_id, REMINDER_PAGE_SIZE, session, before_id=before_id
+                    )
+                for user_id, telegram_id in recipients:
+                    reminder_text = _pick_reminder_text(reminder_text_variants, reminder_text_fallback)
+                    if reminder_text is not None:
+                        yield Reminder(user_id=user_id, telegram_id=telegram_id, text=reminder_text)
+                if len(recipients) < REMINDER_PAGE_SIZE:
+                    return
+                after_id = recipients[-1][0]
+
+        async def mark_reminded(user_ids: list[int]) -> None:
+            async with db.session_factory.begin() as session:
+                await mark_users_reminded(user_ids=user_ids, timestamp=due, db_session=session)
+
+        stats = await send_reminders(bot, due_reminders(), mark_reminded, run=run)
+        logger.info(
+            "Reminder shard %s processed: %s sent, %s refused, %s failed, %s skipped",
+            shard,
+            stats.sent,
+            stats.refused,
+            stats.failed,
+            stats.skipped,
+        )
+        if stats.failed and not last_attempt:
+            # Failed sends were released, so the retry sends them again and skips everyone confirmed.
+            raise RuntimeError(f"{stats.failed} reminders of shard {shard} could not be sent")
+        summary = await run.finish_shard(shard, stats)
+        if summary is not None:
+            await _notify_admin_about_reminders(bot, due, summary)
     except Exception as exc:  # noqa: BLE001
-        logger.exception("Failed to process reminders", exc_info=exc)
-        await notify_admin_about_exception(bot, exc, context="process_user_reminders")
+        logger.exception("Failed to process reminder shard %s", shard, exc_info=exc)
+        await notify_admin_about_exception(bot, exc, context=f"send_reminder_batch (shard {shard})")
+        if last_attempt:
+            summary = await run.finish_shard(shard, ReminderStats(), exhausted=True)
+            if summary is not None:
+                await _notify_admin_about_reminders(bot, due, summary)
         raise
     finally:
         await bot.session.close()
 
 
+async def _notify_admin_about_reminders(bot: Bot, reminder_due: datetime, summary: dict[str, int]) -> None:
+    text = (
+        f"Reminders for {reminder_due:%Y-%m-%d %H:%M} UTC: {summary.get('sent', 0)} sent, "
+        f"{summary.get('refused', 0)} refused, {summary.get('failed', 0)} failed, "
+        f"{summary.get('skipped', 0)} already sent ({summary['shards']} shards)"
+    )
+    if summary.get("exhausted"):
+        text += f", {summary['exhausted']} shards gave up after {REMINDER_SHARD_RETRIES} attempts"
+    logger.info(text)
+    try:
+        await bot.send_message(get_settings().ADMIN, text, disable_notification=True)
+    except (TelegramForbiddenError, TelegramNotFound) as exc:
+        logger.warning("Unable to send reminder summary to admin: %s", exc)
+
+
 @broker.task(schedule=[{"cron": _cron_at_starting_mark()}])
 async def process_daily_routine() -> None:
     """
     Replacement for the old `daily_routine()` loop.
     """
     settings = get_settings()
-    bot = Bot(token=settings.BOT_TOKEN.get_secret_value(), default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    bot = create_bot(settings, redis)
     try:
-        async with db.session_factory.begin() as session:
-            await collect_garbage(session)
+        await collect_garbage(db)
 
+        today_utc = datetime.now(timezone.utc).date()
         async with db.session_factory() as session:
             almost_over_text = await get_text_by_prompt(prompt="subscribtion_almost_over", db_session=session)
             over_text = await get_text_by_prompt(prompt="subscribtion_over", db_session=session)
-            users = await get_all_users_with_active_subscription(session)
-
-        today_utc = datetime.now(timezone.utc).date()
-        for user in users:
-            if not user.subscription_expired_at:
-                continue
-            days_to_expiry = (user.subscription_expired_at - today_utc).days
-            if days_to_expiry == 1:
-                try:
-                    await bot.send_message(
-                        chat_id=user.telegram_id,
-                        text=almost_over_text,
-                        reply_markup=get_premium_keyboard(),
-                    )
-                except (TelegramForbiddenError, TelegramNotFound) as exc:
-                    logger.warning("Telegram refused delivery to %s: %s", user, exc)
-                except Exception as send_exc:  # noqa: BLE001
-                    logger.exception("Failed to send subscription reminder to %s", user, exc_info=send_exc)
-                else:
-                    logger.info("Ending subscription reminder was sent to %s", user)
-            elif days_to_expiry == 0:
-                await _set_subscription_status(user_id=user.id, new_status=UserSubscriptionType.ACCESS_EXPIRED)
-                try:
-                    await bot.send_message(
-                        chat_id=user.telegram_id,
-                        text=over_text,
-                        reply_markup=get_premium_keyboard(),
-                    )
-                except (TelegramForbiddenError, TelegramNotFound) as exc:
-                    logger.warning("Telegram refused delivery to %s: %s", user, exc)
-                except Exception as send_exc:  # noqa: BLE001
-                    logger.exception("Failed to send subscription expiration notice to %s", user, exc_info=send_exc)
-                else:
-                    logger.info("Ending subscription notification was sent to %s", user)
-
-            await asyncio.sleep(0.05)
+            expiring_ids = await get_telegram_ids_with_subscription_expiring_on(today_utc + timedelta(days=1), session)
+            expired_ids = await expire_subscriptions(today_utc, session)
+            if expired_ids:
+                await commit_and_invalidate(session, CacheScope.USERS)
+
+        almost_over_stats, over_stats = await asyncio.gather(
+            send_notifications(bot, expiring_ids, almost_over_text, reply_markup=get_premium_keyboard()),
+            send_notifications(bot, expired_ids, over_text, reply_markup=get_premium_keyboard()),
+        )
+        logger.info(
+            "Subscriptions: %s expire tomorrow (%s notified), %s expired today (%s notified)",
+            len(expiring_ids),
+            almost_over_stats.sent,
+            len(expired_ids),
+            over_stats.sent,
+        )
     except Exception as exc:  # noqa: BLE001
         logger.exception("Failed to process daily routine", exc_info=exc)
         await notify_admin_about_exception(bot, exc, context="process_daily_routine")
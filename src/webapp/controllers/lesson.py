@@ -4,8 +4,10 @@ from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.crud.lesson import get_lesson_by_id
+from database.crud.lesson_slide import replace_lesson_slides
+from database.invalidation import commit_and_invalidate
 from database.models.lesson import Lesson
-from enums import LessonStatus, PathType, SlidesMenuType
+from enums import CacheScope, LessonStatus, PathType, SlidesMenuType
 from lesson_path import LessonPath
 from webapp.db import AsyncDBSession
 from webapp.schemas.lesson import ActiveLessonsTableSchema, EditingLessonsTableSchema
@@ -87,6 +89,9 @@ async def update_lesson_path(
                 lesson.path_extra = compose_lesson_path(index, lesson.path_extra, mode, slide_id)
         case _:
             raise AssertionError(f"Unexpected source: {source}")
+    path = lesson.path if source == SlidesMenuType.REGULAR else lesson.path_extra
+    await replace_lesson_slides(lesson_id, source, path, db_session)
+    await commit_and_invalidate(db_session, CacheScope.LESSONS, lesson_id)
 
 
 def compose_lesson_path(index, path, mode, slide_id) -> str:
@@ -4,12 +4,13 @@ import logging
 from pathlib import Path
 
 from PIL import Image
-import aiofiles
-import aiohttp
-from aiohttp import FormData
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import FSInputFile, Message
 import fastapi
 
 from config import Settings
+from consts import NEWSLETTER_CONCURRENCY
 from database.models.slide import Slide
 from enums import SlideType, UserSubscriptionType
 from webapp.schemas.slide import EditImageSlideData
@@ -79,49 +80,47 @@ async def extract_img_from_form(request: fastapi.Request):
         return data
 
 
-async def send_newsletter(bot_token: str, user_id: int, message: str, image_path: Path = None) -> None:
-    async with aiohttp.ClientSession() as session:
-        if image_path is not None:
-            url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
-            data = FormData()
-            data.add_field("chat_id", str(user_id))
-            data.add_field("caption", message)
-            data.add_field("disable_notification", True)
-            data.add_field("parse_mode", "HTML")
-            async with aiofiles.open(image_path, "rb") as photo:
-                photo_data = await photo.read()
-                data.add_field("photo", photo_data, filename=image_path.name)
-
-            text_ok = (
-                f'Сообщение с рассылкой "{message}" и файлом {image_path.name} было отправлено пользователю {user_id}.'
-            )
-            text_error = (
-                f'Произошла ошибка при отправке рассылки "{message}" и файлом {image_path.name} пользователю {user_id}: '
-                + "{}. {}"
-            )
+async def send_newsletter(
+    bot: Bot, user_id: int, message: str, photo: str | FSInputFile | None = None
+) -> Message | None:
+    if photo is not None:
+        file_name = photo.filename if isinstance(photo, FSInputFile) else photo
+        text_ok = f'Сообщение с рассылкой "{message}" и файлом {file_name} было отправлено пользователю {user_id}.'
+        text_error = (
+            f'Произошла ошибка при отправке рассылки "{message}" и файлом {file_name} пользователю {user_id}: {{}}'
+        )
+    else:
+        text_ok = f'Сообщение с рассылкой "{message}" было отправлено пользователю {user_id}.'
+        text_error = f'Произошла ошибка при отправке рассылки "{message}" пользователю {user_id}: {{}}'
+    try:
+        if photo is not None:
+            sent = await bot.send_photo(chat_id=user_id, photo=photo, caption=message, disable_notification=True)
         else:
-            url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-            data = {
-                "chat_id": str(user_id),
-                "text": message,
-                "disable_notification": True,
-                "parse_mode": "HTML",
-            }
-            text_ok = f'Сообщение с рассылкой "{message}" было отправлено пользователю {user_id}.'
-            text_error = f'Произошла ошибка при отправке рассылки "{message}" пользователю {user_id}: ' + "{}. {}"
-
-        async with session.post(url, data=data) as response:
-            if response.status == 200:
-                logger.info(text_ok)
-            else:
-                error_text = await response.text()
-                logger.info(text_error.format(response.status, error_text))
-
-
-async def send_newsletter_to_users(bot_token: str, users: list[int], message: str, image_path: Path = None) -> None:
-    for user in users:
-        await send_newsletter(bot_token, user, message, image_path)
-        await asyncio.sleep(1)
+            sent = await bot.send_message(chat_id=user_id, text=message, disable_notification=True)
+    except TelegramAPIError as exc:
+        logger.info(text_error.format(exc))
+        return None
+    logger.info(text_ok)
+    return sent
+
+
+async def send_newsletter_to_users(bot: Bot, users: list[int], message: str, image_path: Path = None) -> None:
+    # Pacing is left to the bot's rate limiter, so sends only need bounded concurrency.
+    photo = FSInputFile(image_path) if image_path is not None else None
+    remaining = list(users)
+    while isinstance(photo, FSInputFile) and remaining:
+        # Upload the picture once, everyone else gets it by file_id.
+        sent = await send_newsletter(bot, remaining.pop(0), message, photo)
+        if sent is not None:
+            photo = sent.photo[-1].file_id
+
+    semaphore = asyncio.Semaphore(NEWSLETTER_CONCURRENCY)
+
+    async def send(user_id: int) -> None:
+        async with semaphore:
+            await send_newsletter(bot, user_id, message, photo)
+
+    await asyncio.gather(*(send(user_id) for user_id in remaining))
 
 
 def image_upload(image_file: bytes, form: EditImageSlideData, lesson_id: int, settings: Settings):
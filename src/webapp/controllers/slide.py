@@ -2,6 +2,7 @@ import logging
 
 from fastui import components as c
 
+from database.crud.lesson_slide import replace_lesson_slides
 from database.crud.slide import get_slides_by_ids
 from database.models.lesson import Lesson
 from database.models.slide import Slide
@@ -150,10 +151,11 @@ def get_edit_slide_form_by_slide_type(
     return form
 
 
-def delete_slide(
+async def delete_slide(
     lesson: Lesson,
     source: SlidesMenuType,
     index: int,
+    db_session: AsyncDBSession,
 ):
     match source:
         case SlidesMenuType.REGULAR:
@@ -166,13 +168,15 @@ def delete_slide(
             lesson.path_extra = str(lesson_path)
         case _:
             raise AssertionError(f"Unexpected source: {source}")
+    await replace_lesson_slides(lesson.id, source, str(lesson_path), db_session)
 
 
-def move_slide(
+async def move_slide(
     lesson: Lesson,
     source: SlidesMenuType,
     mode: MoveSlideDirection,
     index: int,
+    db_session: AsyncDBSession,
 ):
     match source:
         case SlidesMenuType.REGULAR:
@@ -185,3 +189,4 @@ def move_slide(
             lesson.path_extra = str(lesson_path)
         case _:
             raise AssertionError(f"Unexpected source: {source}")
+    await replace_lesson_slides(lesson.id, source, str(lesson_path), db_session)
@@ -1,41 +1,32 @@
-from database.crud.lesson import get_lesson_by_id
+from consts import TOP_BAD_SLIDES_MIN_ATTEMPTS
+from database.crud.lesson_slide import get_slide_locations
 from database.crud.quiz_answer import get_top_error_slides
 from database.crud.session import get_sessions_statistics
-from database.crud.slide import get_slide_by_id
-from enums import SessionStatus, SlidesMenuType
-from lesson_path import LessonPath
+from enums import SessionStatus
 from webapp.controllers.misc import get_slide_emoji
 from webapp.db import AsyncDBSession
 from webapp.schemas.statistics import SessionStatistics, SessionsStatisticsTableSchema, SlidesStatisticsTableSchema
 
 
-async def get_errors_stats_table_content(limit: int, db_session: AsyncDBSession) -> list:
-    slides_by_errors = await get_top_error_slides(db_session)
+async def get_errors_stats_table_content(
+    limit: int,
+    db_session: AsyncDBSession,
+    min_attempts: int = TOP_BAD_SLIDES_MIN_ATTEMPTS,
+) -> list:
+    slides_by_errors = await get_top_error_slides(limit, min_attempts, db_session)
+    locations = await get_slide_locations([i.slide_id for i in slides_by_errors], db_session)
     stats = []
     for i in slides_by_errors:
-        slide = await get_slide_by_id(i.slide_id, db_session)
-        if slide is None:
+        location = locations.get(i.slide_id)
+        if location is None:
             continue
-        lesson = await get_lesson_by_id(slide.lesson_id, db_session)
-        if lesson is None:
-            continue
-        lesson_path = LessonPath(lesson.path).path
-        lesson_path_extra = LessonPath(lesson.path_extra).path
-        try:
-            index = lesson_path.index(i.slide_id)
-            source = SlidesMenuType.REGULAR
-        except ValueError:
-            try:
-                index = lesson_path_extra.index(i.slide_id)
-                source = SlidesMenuType.EXTRA
-            except ValueError:
-                continue
-        link = f"/slides/edit/{source}/{slide.slide_type}/{slide.id}/{index + 1}/"
+        slide = location.slide
+        link = f"/slides/edit/{location.source}/{slide.slide_type}/{slide.id}/{location.index}/"
         slide_data = {
             "slide_type": get_slide_emoji(slide.slide_type),
             "is_exam_slide": "🎓" if slide.is_exam_slide else " ",
             "slide_id": str(slide.id),
-            "lesson_title": lesson.title,
+            "lesson_title": location.lesson_title,
             "count_correct": str(i.correct),
             "count_wrong": str(i.wrong),
             "icon": "✏️",
@@ -44,8 +35,6 @@ async def get_errors_stats_table_content(limit: int, db_session: AsyncDBSession)
         }
         validated_slide = SlidesStatisticsTableSchema.model_validate(slide_data)
         stats.append(validated_slide)
-        if len(stats) == limit:
-            break
     return stats
 
 
@@ -16,8 +16,9 @@ from database.crud.lesson import (
     update_lesson_status,
 )
 from database.crud.session import abort_in_progress_sessions_by_lesson
+from database.invalidation import commit_and_invalidate
 from database.models.lesson import Lesson
-from enums import LessonStatus
+from enums import CacheScope, LessonStatus
 from webapp.controllers.lesson import (
     get_active_lessons_fastui,
     get_editing_lessons_fastui,
@@ -103,6 +104,7 @@ async def edit_lesson_form(
         await update_lesson_status(lesson_id, LessonStatus.EDITING, db_session)
         await recompose_lesson_indexes(index, db_session)
         await abort_in_progress_sessions_by_lesson(lesson.id, db_session)
+        await commit_and_invalidate(db_session, CacheScope.SESSIONS, lesson.id)
     elif lesson_status == LessonStatus.EDITING and form.is_active is True:
         lesson.index = len(await get_active_lessons(db_session)) + 1
         logger.info(f"index updated to {lesson.index}")
@@ -202,6 +204,7 @@ async def delete_lesson(
         # noinspection PyTypeChecker
         await recompose_lesson_indexes(indx, db_session)
     await abort_in_progress_sessions_by_lesson(lesson_id, db_session)
+    await commit_and_invalidate(db_session, CacheScope.SESSIONS, lesson_id)
     return [c.FireEvent(event=GoToEvent(url="/lessons"))]
 
 
@@ -9,7 +9,9 @@ from fastui import AnyComponent, FastUI
 from fastui import components as c
 from fastui.events import GoToEvent
 from fastui.forms import fastui_form
+from redis.asyncio import Redis
 
+from bot.internal.client import create_bot
 from config import Settings, get_settings
 from consts import IMAGE_WIDTH
 from database.crud.user import get_all_users
@@ -44,6 +46,15 @@ async def newsletter_page_response() -> list[AnyComponent]:
     )
 
 
+async def _send_newsletter(settings: Settings, users: list[int], text: str, image_path: Path | None = None) -> None:
+    redis = Redis.from_url(settings.REDIS_URL)
+    try:
+        async with create_bot(settings, redis) as bot:
+            await send_newsletter_to_users(bot, users, text, image_path)
+    finally:
+        await redis.aclose()
+
+
 @router.post("/send/", response_model=FastUI, response_model_exclude_none=True)
 async def send_newsletter(
     image_file: Annotated[bytes, Depends(extract_img_from_form)],
@@ -65,13 +76,8 @@ async def send_newsletter(
             with open(file_path, "wb") as buffer:
                 image_format = form.upload_new_picture.content_type
                 image.save(buffer, format=image_format.split("/")[1])
-            await send_newsletter_to_users(
-                settings.BOT_TOKEN.get_secret_value(),
-                users,
-                text,
-                file_path,
-            )
+            await _send_newsletter(settings, users, text, file_path)
 
     else:
-        await send_newsletter_to_users(settings.BOT_TOKEN.get_secret_value(), users, text)
+        await _send_newsletter(settings, users, text)
     return [c.FireEvent(event=GoToEvent(url="/newsletter/sent/"))]
@@ -7,8 +7,9 @@ from fastui import components as c
 from fastui.events import GoToEvent
 from fastui.forms import fastui_form
 
+from database.invalidation import commit_and_invalidate
 from database.models.reaction import Reaction
-from enums import ReactionType
+from enums import CacheScope, ReactionType
 from webapp.controllers.reaction import delete_reaction_by_id, get_reaction_by_id, get_reactions_table_content
 from webapp.db import AsyncDBSession
 from webapp.routers.components.buttons import back_button
@@ -89,6 +90,7 @@ async def add_reaction(
 ):
     reaction = Reaction(type=reaction_type, text=form.text)
     db_session.add(reaction)
+    await commit_and_invalidate(db_session, CacheScope.REACTIONS)
     return [c.FireEvent(event=GoToEvent(url="/reactions"))]
 
 
@@ -116,6 +118,7 @@ async def edit_lesson_form(
         form_value = getattr(form, field, None)
         if form_value is not None:
             setattr(reaction, field, form_value)
+    await commit_and_invalidate(db_session, CacheScope.REACTIONS)
     logger.info(f"reaction {reaction.id} updated. data: {form.dict()}")
     return [c.FireEvent(event=GoToEvent(url="/reactions"))]
 
@@ -148,4 +151,5 @@ async def delete_slide_response(
 ):
     logger.info(f"reaction with id {reaction_id} deleted")
     await delete_reaction_by_id(reaction_id, db_session)
+    await commit_and_invalidate(db_session, CacheScope.REACTIONS)
     return [c.FireEvent(event=GoToEvent(url="/reactions"))]
@@ -8,8 +8,9 @@ from fastui.events import GoToEvent
 from consts import ERRORS_THRESHOLD, IMAGE_WIDTH
 from database.crud.lesson import get_lesson_by_id
 from database.crud.slide import get_slide_by_id
+from database.invalidation import commit_and_invalidate
 from database.models.lesson import Lesson
-from enums import MoveSlideDirection, PathType, SlideType, SlidesMenuType, StickerType
+from enums import CacheScope, MoveSlideDirection, PathType, SlideType, SlidesMenuType, StickerType
 from lesson_path import LessonPath
 from webapp.controllers.lesson import update_lesson_path
 from webapp.controllers.slide import (
@@ -221,7 +222,8 @@ async def confirm_delete_slide(
 ):
     lesson: Lesson = await get_lesson_by_id(lesson_id, db_session)
     logger.info(f"deleting slide from lesson {lesson_id}. index: {index}, source: {source}")
-    delete_slide(lesson, source, index)
+    await delete_slide(lesson, source, index, db_session)
+    await commit_and_invalidate(db_session, CacheScope.LESSONS, lesson_id)
     return [c.FireEvent(event=GoToEvent(url=f"/slides/lesson{lesson_id}/"))]
 
 
@@ -234,6 +236,7 @@ async def move_slide_by_direction(
     db_session: AsyncDBSession,
 ) -> list[AnyComponent]:
     lesson: Lesson = await get_lesson_by_id(lesson_id, db_session)
-    move_slide(lesson, source, direction, index)
+    await move_slide(lesson, source, direction, index, db_session)
+    await commit_and_invalidate(db_session, CacheScope.LESSONS, lesson_id)
     logger.info(f"moved slide {direction} in lesson: {lesson_id}. index: {index}. source: {source}")
     return [c.FireEvent(event=GoToEvent(url=f"/slides/lesson{lesson_id}/"))]
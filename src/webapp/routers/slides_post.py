@@ -9,8 +9,9 @@ from fastui.forms import fastui_form
 
 from config import Settings, get_settings
 from database.crud.slide import get_slide_by_id
+from database.invalidation import commit_and_invalidate
 from database.models.slide import Slide
-from enums import KeyboardType, PathType, SlideType, SlidesMenuType, StickerType
+from enums import CacheScope, KeyboardType, PathType, SlideType, SlidesMenuType, StickerType
 from webapp.controllers.lesson import update_lesson_path
 from webapp.controllers.misc import extract_img_from_form, image_upload
 from webapp.db import AsyncDBSession
@@ -185,6 +186,7 @@ async def edit_image_slide(
     if form.upload_new_picture.filename != "":
         image_upload(image_file, form, slide.lesson_id, settings)
         slide.picture = form.upload_new_picture.filename
+        await commit_and_invalidate(db_session, CacheScope.LESSONS, slide.lesson_id)
     else:
         slide_picture = form.select_picture if form.select_picture else slide.picture
         new_slide: Slide = Slide(
@@ -7,6 +7,8 @@ from fastui import components as c
 from fastui.events import GoToEvent
 from fastui.forms import fastui_form
 
+from database.invalidation import commit_and_invalidate
+from enums import CacheScope
 from webapp.controllers.text import get_text_by_id, get_texts_table_content
 from webapp.db import AsyncDBSession
 from webapp.routers.components.buttons import back_button
@@ -48,5 +50,6 @@ async def edit_text_form(
         form_value = getattr(form, field, None)
         if form_value is not None:
             setattr(text, field, form_value)
+    await commit_and_invalidate(db_session, CacheScope.TEXTS)
     logger.info(f"text {text.id} updated. data: {form.dict()}")
     return [c.FireEvent(event=GoToEvent(url="/texts"))]
@@ -8,6 +8,7 @@ from fastui import components as c
 from fastui.events import GoToEvent
 from fastui.forms import fastui_form
 import arrow
+from redis.asyncio import Redis
 
 from database.crud.user import get_user_from_db_by_id
 from database.crud.lesson import (
@@ -16,7 +17,8 @@ from database.crud.lesson import (
 )
 from database.crud.session import get_in_progress_lessons_recent_first
 from database.crud.slide import get_slide_by_id
-from enums import SelectOneEnum, UserSubscriptionType
+from database.invalidation import commit_and_invalidate
+from enums import CacheScope, SelectOneEnum, UserSubscriptionType
 from lesson_path import LessonPath
 from webapp.controllers.users import get_users_table_content
 from webapp.db import AsyncDBSession
@@ -24,9 +26,7 @@ from webapp.routers.components.buttons import back_button, create_send_message_b
 from webapp.routers.components.components import get_common_content, get_users_page
 from webapp.schemas.user import EditUserModel, SendMessageModel, get_user_data_model
 from config import get_settings
-from aiogram import Bot
-from aiogram.client.default import DefaultBotProperties
-from aiogram.enums import ParseMode
+from bot.internal.client import create_bot
 from aiogram.exceptions import TelegramForbiddenError
 
 router = APIRouter()
@@ -158,7 +158,7 @@ async def edit_user(
         user.subscription_status = UserSubscriptionType.NO_ACCESS
         user.subscription_expired_at = None
 
-    await db_session.flush()
+    await commit_and_invalidate(db_session, CacheScope.USERS, user.telegram_id)
     return [c.FireEvent(event=GoToEvent(url="/users"))]
 
 
@@ -218,14 +218,14 @@ async def send_message(
     settings = get_settings()
     if not getattr(user, "telegram_id", None):
         return [c.FireEvent(event=GoToEvent(url=f"/users/send_message/{user_id}/?error=notelegram"))]
+    redis = Redis.from_url(settings.REDIS_URL)
     try:
-        async with Bot(
-            token=settings.BOT_TOKEN.get_secret_value(),
-            default=DefaultBotProperties(parse_mode=ParseMode.HTML),
-        ) as bot:
+        async with create_bot(settings, redis) as bot:
             await bot.send_message(chat_id=user.telegram_id, text=form.message)
     except TelegramForbiddenError:
         return [c.FireEvent(event=GoToEvent(url=f"/users/send_message/{user_id}/?error=forbidden"))]
     except Exception:
         return [c.FireEvent(event=GoToEvent(url=f"/users/send_message/{user_id}/?error=unknown"))]
+    finally:
+        await redis.aclose()
     return [c.FireEvent(event=GoToEvent(url=f"/users/send_message/{user_id}/?status=sent"))]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+
+import uvicorn
+from aiogram.fsm.storage.memory import MemoryStorage
+from redis.asyncio import Redis
+
+from bot.internal.commands import set_bot_commands
+from bot.internal.notify_admin import on_startup_notify
+from bot.internal.client import create_bot
+from bot.runtime import build_dispatcher, setup_process
+from bot.webhook import create_webhook_app
+from database.tables_helper import get_db
+
+
+async def main(host: str, port: int) -> None:
+    settings = setup_process("webhook")
+    if not settings.WEBHOOK_URL:
+        raise SystemExit("WEBHOOK_URL is required to run the bot in webhook mode")
+    redis = Redis.from_url(settings.REDIS_URL)
+    bot = create_bot(settings, redis)
+    # Built only to learn which update types the routers handle; updates are processed by the stream workers.
+    allowed_updates = build_dispatcher(MemoryStorage(), get_db()).resolve_used_update_types()
+    app = create_webhook_app(settings, redis, bot, allowed_updates)
+    try:
+        await set_bot_commands(bot)
+        await on_startup_notify(bot)
+        logging.info("webhook started")
+        await uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_config=None)).serve()
+    finally:
+        await bot.session.close()
+
+
+def run_main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Receive Telegram updates via webhook and queue them for the bot.")
+    parser.add_argument("--host", default=os.getenv("WEBHOOK_HOST", "127.0.0.1"), help="Bind host.")
+    parser.add_argument("--port", type=int, default=int(os.getenv("WEBHOOK_PORT", "8080")), help="Bind port.")
+    args = parser.parse_args(argv)
+    asyncio.run(main(args.host, args.port))
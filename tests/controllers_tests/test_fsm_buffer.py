@@ -0,0 +1,53 @@
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.internal.fsm import CountingStorage
+from bot.middlewares.fsm_middleware import FSMBufferMiddleware
+from enums import States
+
+
+async def test_quiz_update_is_one_read_and_one_write():
+    storage = CountingStorage(MemoryStorage())
+    key = StorageKey(bot_id=0, chat_id=1, user_id=2)
+    await storage.set_data(key, {"session_id": 1})
+    storage.commands.clear()
+
+    async def handler(_, data):
+        state = data["state"]
+        assert (await state.get_data())["session_id"] == 1
+        await state.update_data(quiz_word_msg_id=10)
+        await state.set_state(States.INPUT_WORD)
+        await state.update_data(wrong_answers={"session_id": 1, "slides": {}})
+        assert (await state.get_data())["quiz_word_msg_id"] == 10
+
+    await FSMBufferMiddleware()(handler, object(), {"state": FSMContext(storage, key), "raw_state": None})
+
+    assert storage.commands == {"get_data": 1, "set_data": 1, "set_state": 1}
+    assert await storage.get_data(key) == {
+        "session_id": 1,
+        "quiz_word_msg_id": 10,
+        "wrong_answers": {"session_id": 1, "slides": {}},
+    }
+    assert await storage.get_state(key) == States.INPUT_WORD.state
+
+
+async def test_untouched_state_is_not_written():
+    storage = CountingStorage(MemoryStorage())
+
+    async def handler(_, data):
+        await data["state"].clear()
+        await data["state"].get_state()
+
+    await FSMBufferMiddleware()(
+        handler, object(), {"state": FSMContext(storage, StorageKey(bot_id=0, chat_id=1, user_id=2))}
+    )
+    assert storage.commands == {"set_state": 1, "set_data": 1}
+
+    storage.commands.clear()
+    await FSMBufferMiddleware()(
+        lambda _, data: data["state"].get_data(),
+        object(),
+        {"state": FSMContext(storage, StorageKey(bot_id=0, chat_id=1, user_id=2))},
+    )
+    assert storage.commands == {"get_data": 1}
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy import event
+
+from bot.middlewares.session_middlewares import SessionMiddleware
+from database.database_connector import DatabaseConnector
+from database.invalidation import publish_invalidation
+from database.models.lesson import Lesson
+from database.models.session import Session
+from database.models.user import User
+from enums import CacheScope, SessionStartsFrom
+
+
+async def test_quiz_answer_reads_session_from_fsm(db: "DatabaseConnector"):
+    async with db.session_factory.begin() as session:
+        session.add(User(id=1, telegram_id=42, fullname="abacaba", last_reminded_at=datetime.now(timezone.utc)))
+        session.add(Lesson(id=1, title="abacaba", path="1.2.3"))
+        session.add(Session(id=1, lesson_id=1, user_id=1, path="1.2.3", starts_from=SessionStartsFrom.BEGIN))
+
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=0, chat_id=42, user_id=42))
+    await state.update_data(session_id=1)
+    middleware = SessionMiddleware()
+
+    async def advance(_, data):
+        data["session"].current_step += 1
+        return data["session"]
+
+    async with db.session_factory() as db_session:
+        await middleware(advance, object(), {"state": state, "db_session": db_session})
+
+    statements = []
+    event.listen(db.engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    async with db.session_factory() as db_session:
+        user_session = await middleware(advance, object(), {"state": state, "db_session": db_session})
+    assert user_session.current_step == 2
+    assert not any("FROM sessions" in statement for statement in statements)
+
+    async with db.session_factory() as db_session:
+        assert (await db_session.get(Session, 1)).current_step == 2
+
+    # Sessions aborted from the admin panel are reconciled with the database.
+    await publish_invalidation(CacheScope.SESSIONS, 1)
+    async with db.session_factory() as db_session:
+        await middleware(advance, object(), {"state": state, "db_session": db_session})
+    assert any("FROM sessions" in statement for statement in statements)
+    assert (await state.get_data())["session_snapshot"]["current_step"] == 3
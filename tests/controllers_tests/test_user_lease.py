@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from bot.internal import leases
+from bot.internal.leases import EXTEND_SCRIPT, RELEASE_SCRIPT, setup_user_leases, user_lease
+from enums import Stage
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.extensions = 0
+        self.broken = False
+
+    async def set(self, key, value, nx, px):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token, *args):
+        if self.broken and script == EXTEND_SCRIPT:
+            raise ConnectionError("Connection reset by peer")
+        if self.values.get(key) != token:
+            return 0
+        if script == RELEASE_SCRIPT:
+            del self.values[key]
+        elif script == EXTEND_SCRIPT:
+            self.extensions += 1
+        return 1
+
+
+@pytest.fixture()
+def redis(monkeypatch):
+    monkeypatch.setattr(leases, "_redis", None)
+    redis = FakeRedis()
+    setup_user_leases(redis, Stage.DEV)
+    return redis
+
+
+async def test_local_lease_rejects_concurrent_holder():
+    async with user_lease(1) as acquired:
+        assert acquired
+        async with user_lease(1) as concurrent:
+            assert not concurrent
+        async with user_lease(2) as other_user:
+            assert other_user
+    async with user_lease(1) as acquired:
+        assert acquired
+
+
+async def test_lease_is_released_after_exception():
+    with pytest.raises(ValueError):
+        async with user_lease(1):
+            raise ValueError("123")
+    async with user_lease(1) as acquired:
+        assert acquired
+
+
+async def test_redis_lease(redis):
+    async with user_lease(1, ttl_ms=30) as acquired:
+        assert acquired
+        async with user_lease(1) as concurrent:
+            assert not concurrent
+        await asyncio.sleep(0.05)
+    assert redis.extensions > 0
+    assert redis.values == {}
+
+
+async def test_redis_lease_does_not_release_foreign_token(redis):
+    async with user_lease(1) as acquired:
+        assert acquired
+        key = next(iter(redis.values))
+        redis.values[key] = "someone else"
+    assert redis.values == {key: "someone else"}
+
+
+async def test_redis_lease_is_released_after_keep_alive_failed(redis):
+    redis.broken = True
+    with pytest.raises(ValueError):
+        async with user_lease(1, ttl_ms=30) as acquired:
+            assert acquired
+            await asyncio.sleep(0.05)
+            raise ValueError("123")
+    assert redis.values == {}
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.controllers.processors import quiz_helpers
+from enums import SlideType
+
+
+@pytest.fixture()
+def ctx():
+    storage = MemoryStorage()
+    ctx = FSMContext(storage, StorageKey(bot_id=0, chat_id=1, user_id=2))
+    yield ctx
+
+
+@pytest.fixture()
+def seeds(monkeypatch):
+    seeds = []
+
+    async def fake_get_wrong_answers_by_slide(session_id, db_session):
+        seeds.append(session_id)
+        return {10: 2} if session_id == 1 else {}
+
+    async def fake_log_quiz_answer(*_args):
+        pass
+
+    monkeypatch.setattr(quiz_helpers, "get_wrong_answers_by_slide", fake_get_wrong_answers_by_slide)
+    monkeypatch.setattr(quiz_helpers, "log_quiz_answer", fake_log_quiz_answer)
+    yield seeds
+
+
+async def test_counter_is_seeded_once_per_session(ctx, seeds):
+    slide = SimpleNamespace(id=10, slide_type=SlideType.QUIZ_OPTIONS)
+
+    assert not await quiz_helpers.error_count_exceeded(ctx, 1, slide.id, db_session=None)
+    await quiz_helpers.log_wrong_answer(ctx, 1, slide, db_session=None)
+    assert await quiz_helpers.error_count_exceeded(ctx, 1, slide.id, db_session=None)
+    assert seeds == [1]
+
+    await quiz_helpers.log_wrong_answer(ctx, 2, slide, db_session=None)
+    assert not await quiz_helpers.error_count_exceeded(ctx, 2, slide.id, db_session=None)
+    assert seeds == [1, 2]
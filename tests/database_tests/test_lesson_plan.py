@@ -0,0 +1,55 @@
+from database.database_connector import DatabaseConnector
+from database.invalidation import publish_invalidation
+from database.lesson_plan import get_lesson_plan, lesson_plan_cache
+from database.models.lesson import Lesson
+from database.models.slide import Slide
+from enums import CacheScope, SlideType
+
+
+async def test_lesson_plan_is_compiled_once(db: "DatabaseConnector"):
+    lesson_plan_cache.invalidate()
+    async with db.session_factory.begin() as session:
+        session.add(Lesson(id=1, title="abacaba", path="3.1", path_extra="2"))
+        session.add(Slide(id=1, lesson_id=1, slide_type=SlideType.TEXT, text="hello"))
+        session.add(
+            Slide(
+                id=2,
+                lesson_id=1,
+                slide_type=SlideType.QUIZ_INPUT_WORD,
+                text="I _ here",
+                right_answers="am|'m",
+            )
+        )
+        session.add(Slide(id=3, lesson_id=1, slide_type=SlideType.QUIZ_OPTIONS, right_answers="a", keyboard="b|c"))
+
+    async with db.session_factory() as session:
+        plan = await get_lesson_plan(1, "3.1", "2", session)
+
+    assert plan.path == (3, 1)
+    assert plan.get_steps(in_extra=True) == (2,)
+    assert plan.get_slide(1).text == "hello"
+    assert plan.get_slide(2).right_answers_variants == ("am", "'m")
+    assert plan.get_slide(2).almost_right_answers_variants == ("",)
+    assert plan.get_slide(3).keyboard_variants == ("b", "c")
+
+    # A warm plan never touches the database.
+    assert await get_lesson_plan(1, "3.1", "2", db_session=object()) is plan
+
+    await publish_invalidation(CacheScope.LESSONS, 1)
+    assert len(lesson_plan_cache) == 0
+
+
+async def test_first_exam_slide_follows_path_order(db: "DatabaseConnector"):
+    lesson_plan_cache.invalidate()
+    async with db.session_factory.begin() as session:
+        session.add(Lesson(id=1, title="abacaba", path="4.3.2.1"))
+        session.add(Slide(id=1, lesson_id=1, slide_type=SlideType.QUIZ_OPTIONS, is_exam_slide=True))
+        session.add(Slide(id=2, lesson_id=1, slide_type=SlideType.QUIZ_OPTIONS, is_exam_slide=True))
+        session.add(Slide(id=3, lesson_id=1, slide_type=SlideType.TEXT))
+        session.add(Slide(id=4, lesson_id=1, slide_type=SlideType.TEXT))
+
+    async with db.session_factory() as session:
+        plan = await get_lesson_plan(1, "4.3.2.1", None, session)
+
+    assert plan.first_exam_index == 2
+    assert plan.path[plan.first_exam_index] == 2
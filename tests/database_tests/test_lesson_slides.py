@@ -0,0 +1,49 @@
+from sqlalchemy import select
+
+from database.crud.lesson_slide import get_slide_positions, sync_lesson_slides
+from database.database_connector import DatabaseConnector
+from database.models.lesson import Lesson
+from database.models.lesson_slide import LessonSlide
+from enums import MoveSlideDirection, PathType, SlidesMenuType
+from webapp.controllers.lesson import update_lesson_path
+from webapp.controllers.slide import delete_slide, move_slide
+
+
+async def get_rows(db: "DatabaseConnector", lesson_id: int) -> list[tuple]:
+    async with db.session_factory() as session:
+        query = (
+            select(LessonSlide.kind, LessonSlide.position, LessonSlide.slide_id)
+            .filter(LessonSlide.lesson_id == lesson_id)
+            .order_by(LessonSlide.kind, LessonSlide.position)
+        )
+        return list((await session.execute(query)).tuples())
+
+
+async def test_path_helpers_keep_lesson_slides_in_sync(db: "DatabaseConnector"):
+    async with db.session_factory.begin() as session:
+        lesson = Lesson(id=1, title="abacaba", path="3.1.2", path_extra="7")
+        session.add(lesson)
+        await session.flush()
+        await sync_lesson_slides(lesson, session)
+
+    async with db.session_factory() as session:
+        await update_lesson_path(1, SlidesMenuType.REGULAR, 4, session, 2, PathType.EXISTING_PATH_NEW)
+        await update_lesson_path(1, SlidesMenuType.EXTRA, 8, session, 1, PathType.EXISTING_PATH_EDIT)
+
+    async with db.session_factory() as session:
+        lesson = await session.get(Lesson, 1)
+        await move_slide(lesson, SlidesMenuType.REGULAR, MoveSlideDirection.UP, 4, session)
+        await delete_slide(lesson, SlidesMenuType.REGULAR, 1, session)
+        await session.commit()
+        assert lesson.path == "1.2.4"
+
+    assert await get_rows(db, 1) == [
+        (SlidesMenuType.EXTRA, 1, 8),
+        (SlidesMenuType.REGULAR, 1, 1),
+        (SlidesMenuType.REGULAR, 2, 2),
+        (SlidesMenuType.REGULAR, 3, 4),
+    ]
+
+    async with db.session_factory() as session:
+        positions = await get_slide_positions(4, session)
+    assert [(row.lesson_id, row.kind, row.position) for row in positions] == [(1, SlidesMenuType.REGULAR, 3)]
@@ -0,0 +1,65 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import event
+
+from database.crud.lesson import get_completed_lessons_from_sessions
+from database.crud.session import get_current_session, get_last_session_with_progress, get_wrong_answers_by_slide
+from database.crud.user import (
+    expire_subscriptions,
+    get_due_reminder_recipients,
+    get_telegram_ids_with_subscription_expiring_on,
+)
+from database.database_connector import DatabaseConnector
+
+
+async def explain(db: "DatabaseConnector", crud_call) -> str:
+    executed = []
+
+    def record(_conn, _cursor, statement, parameters, _context, _executemany):
+        executed.append((statement, parameters))
+
+    event.listen(db.engine.sync_engine, "before_cursor_execute", record)
+    async with db.session_factory() as session:
+        await crud_call(session)
+    event.remove(db.engine.sync_engine, "before_cursor_execute", record)
+
+    statement, parameters = executed[-1]
+    async with db.engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "\n".join(row[-1] for row in result)
+
+
+async def test_current_session_uses_partial_index(db: "DatabaseConnector"):
+    plan = await explain(db, lambda session: get_current_session(1, 1, session))
+    assert "ix_sessions_in_progress_user_lesson" in plan
+
+
+async def test_last_session_with_progress_uses_index(db: "DatabaseConnector"):
+    plan = await explain(db, lambda session: get_last_session_with_progress(1, session))
+    assert "ix_sessions_user_status_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_completed_lessons_use_index(db: "DatabaseConnector"):
+    plan = await explain(db, lambda session: get_completed_lessons_from_sessions(1, session))
+    assert "ix_sessions_user_status_created" in plan
+
+
+async def test_wrong_answers_by_slide_is_index_only(db: "DatabaseConnector"):
+    plan = await explain(db, lambda session: get_wrong_answers_by_slide(1, session))
+    assert "COVERING INDEX ix_quiz_answer_logs_session_slide_correct" in plan
+
+
+async def test_due_reminder_recipients_use_index(db: "DatabaseConnector"):
+    reminder_due = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    plan = await explain(db, lambda session: get_due_reminder_recipients(reminder_due, [1, 3, 7], 0, 1000, session))
+    assert "ix_users_reminder_freq_last_reminded_at" in plan
+
+
+async def test_subscription_expiry_uses_index(db: "DatabaseConnector"):
+    plan = await explain(db, lambda session: expire_subscriptions(date(2026, 10, 18), session))
+    assert "ix_users_subscription_status_expired_at" in plan
+    plan = await explain(
+        db, lambda session: get_telegram_ids_with_subscription_expiring_on(date(2026, 10, 19), session)
+    )
+    assert "ix_users_subscription_status_expired_at" in plan
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from database.crud.quiz_answer import log_quiz_answer
+from database.database_connector import DatabaseConnector
+from database.models.quiz_answer_log import QuizAnswerLog
+from database.models.slide_answer_stats import SlideAnswerStats
+from database import quiz_answer_buffer
+from database.quiz_answer_buffer import QuizAnswerLogBuffer, quiz_answer_log_buffer
+from enums import SlideType
+
+
+async def count_logs(db: "DatabaseConnector") -> int:
+    async with db.session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(QuizAnswerLog))
+
+
+async def test_buffer_flushes_full_batches_and_on_stop(db: "DatabaseConnector"):
+    buffer = QuizAnswerLogBuffer(batch_size=2, flush_interval=60)
+    buffer.start(db)
+    for slide_id in (1, 2, 3):
+        buffer.add({"session_id": 1, "slide_id": slide_id, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": False})
+        await asyncio.sleep(0.05)
+    assert await count_logs(db) == 2
+
+    await buffer.stop()
+    assert await count_logs(db) == 3
+    assert not buffer.is_running
+
+
+async def test_stop_waits_for_batch_in_flight(db: "DatabaseConnector", monkeypatch):
+    add_slide_answer_stats = quiz_answer_buffer.add_slide_answer_stats
+    writing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_add_slide_answer_stats(rows, db_session):
+        writing.set()
+        await release.wait()
+        await add_slide_answer_stats(rows, db_session)
+
+    monkeypatch.setattr(quiz_answer_buffer, "add_slide_answer_stats", slow_add_slide_answer_stats)
+    buffer = QuizAnswerLogBuffer(batch_size=2, flush_interval=60)
+    buffer.start(db)
+    for slide_id in (1, 2):
+        buffer.add({"session_id": 1, "slide_id": slide_id, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": False})
+    await writing.wait()
+    buffer.add({"session_id": 1, "slide_id": 3, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": False})
+
+    stopping = asyncio.create_task(buffer.stop())
+    await asyncio.sleep(0.05)
+    assert not stopping.done()
+    release.set()
+    await stopping
+    assert await count_logs(db) == 3
+
+
+async def test_rejected_answers_are_dropped(db: "DatabaseConnector", monkeypatch):
+    add_slide_answer_stats = quiz_answer_buffer.add_slide_answer_stats
+
+    async def failing_add_slide_answer_stats(rows, db_session):
+        if any(row["slide_id"] == 99 for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("slide 99 was deleted"))
+        await add_slide_answer_stats(rows, db_session)
+
+    monkeypatch.setattr(quiz_answer_buffer, "add_slide_answer_stats", failing_add_slide_answer_stats)
+    buffer = QuizAnswerLogBuffer(batch_size=100, flush_interval=60)
+    buffer.start(db)
+    for slide_id in (1, 99, 2):
+        buffer.add({"session_id": 1, "slide_id": slide_id, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": False})
+    await buffer.flush()
+    assert await count_logs(db) == 2
+    assert buffer.dropped == 1
+
+    # The rejected row is gone, so later batches are written in one go again.
+    buffer.add({"session_id": 1, "slide_id": 3, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": False})
+    await buffer.stop()
+    assert await count_logs(db) == 3
+
+
+async def test_answers_wait_out_a_database_outage(db: "DatabaseConnector", monkeypatch):
+    add_slide_answer_stats = quiz_answer_buffer.add_slide_answer_stats
+    calls = []
+    outage = True
+
+    async def flaky_add_slide_answer_stats(rows, db_session):
+        calls.append(len(rows))
+        if outage:
+            raise OperationalError("INSERT", {}, Exception("connection refused"))
+        await add_slide_answer_stats(rows, db_session)
+
+    monkeypatch.setattr(quiz_answer_buffer, "add_slide_answer_stats", flaky_add_slide_answer_stats)
+    buffer = QuizAnswerLogBuffer(batch_size=100, flush_interval=60, max_rows=3)
+    buffer.start(db)
+    for slide_id in (1, 2):
+        buffer.add({"session_id": 1, "slide_id": slide_id, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": False})
+    await buffer.flush()
+    # A failed batch is kept whole instead of being retried one transaction per row.
+    assert calls == [2]
+    for slide_id in (3, 4):
+        buffer.add({"session_id": 1, "slide_id": slide_id, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": False})
+    assert buffer.dropped == 1
+
+    with pytest.raises(RuntimeError, match="3 quiz answers"):
+        await buffer.stop()
+
+    outage = False
+    await buffer.flush()
+    assert await count_logs(db) == 3
+
+
+async def test_flush_keeps_slide_rollup_in_step(db: "DatabaseConnector"):
+    buffer = QuizAnswerLogBuffer(batch_size=100, flush_interval=60)
+    buffer.start(db)
+    for slide_id, is_correct in ((1, False), (1, True), (2, False)):
+        buffer.add(
+            {"session_id": 1, "slide_id": slide_id, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": is_correct}
+        )
+    await buffer.flush()
+    buffer.add({"session_id": 1, "slide_id": 1, "slide_type": SlideType.QUIZ_OPTIONS, "is_correct": False})
+    await buffer.stop()
+
+    async with db.session_factory() as session:
+        query = select(SlideAnswerStats.slide_id, SlideAnswerStats.correct_count, SlideAnswerStats.wrong_count)
+        rows = (await session.execute(query.order_by(SlideAnswerStats.slide_id))).tuples()
+        assert list(rows) == [(1, 1, 2), (2, 0, 1)]
+
+
+async def test_log_quiz_answer_goes_through_running_buffer(db: "DatabaseConnector"):
+    quiz_answer_log_buffer.start(db)
+    try:
+        await log_quiz_answer(1, 1, SlideType.QUIZ_INPUT_WORD, True, db_session=object())
+        assert await count_logs(db) == 0
+        await quiz_answer_log_buffer.flush()
+        assert await count_logs(db) == 1
+    finally:
+        await quiz_answer_log_buffer.stop()
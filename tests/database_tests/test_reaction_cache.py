@@ -0,0 +1,38 @@
+from database.crud.answer import get_random_answer, invalidate_reactions_cache
+from database.database_connector import DatabaseConnector
+from database.invalidation import publish_invalidation
+from database.models.reaction import Reaction
+from enums import CacheScope, ReactionType
+
+
+async def test_reactions_do_not_repeat_per_chat(db: "DatabaseConnector"):
+    invalidate_reactions_cache()
+    right = {"great", "nice", "well done"}
+    async with db.session_factory.begin() as session:
+        session.add_all(Reaction(type=ReactionType.RIGHT, text=text) for text in right)
+        session.add(Reaction(type=ReactionType.WRONG, text="oops"))
+
+    async with db.session_factory() as session:
+        first = await get_random_answer(ReactionType.RIGHT, session, chat_id=1)
+
+    # Both reaction types are loaded at once, warm picks need no database.
+    picks = [first] + [await get_random_answer(ReactionType.RIGHT, object(), chat_id=1) for _ in range(2)]
+    assert set(picks) == right
+    assert await get_random_answer(ReactionType.WRONG, object(), chat_id=1) == "oops"
+    assert await get_random_answer(ReactionType.RIGHT, object(), chat_id=2) in right
+
+
+async def test_reactions_reload_after_invalidation(db: "DatabaseConnector"):
+    invalidate_reactions_cache()
+    async with db.session_factory.begin() as session:
+        session.add(Reaction(type=ReactionType.RIGHT, text="great"))
+    async with db.session_factory() as session:
+        assert await get_random_answer(ReactionType.RIGHT, session, chat_id=1) == "great"
+
+    async with db.session_factory.begin() as session:
+        reaction = await session.get(Reaction, 1)
+        reaction.text = "superb"
+    await publish_invalidation(CacheScope.REACTIONS)
+
+    async with db.session_factory() as session:
+        assert await get_random_answer(ReactionType.RIGHT, session, chat_id=1) == "superb"
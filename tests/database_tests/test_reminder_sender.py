@@ -0,0 +1,202 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+from fakeredis import FakeAsyncRedis
+from sqlalchemy import select
+
+from bot.controllers.user_controllers import get_reminder_slot
+from database.crud.user import (
+    get_due_reminder_recipients,
+    get_due_reminder_shard_starts,
+    get_reminder_frequencies,
+    mark_users_reminded,
+)
+from database.database_connector import DatabaseConnector
+from database.models.user import User
+from enums import Stage
+from tasks.reminders import (
+    Reminder,
+    ReminderRun,
+    ReminderStats,
+    send_notifications,
+    send_reminders,
+)
+
+
+async def as_stream(reminders: list[Reminder]):
+    for reminder in reminders:
+        yield reminder
+
+
+class FakeBot:
+    def __init__(self, blocked: set[int], broken: set[int]):
+        self.blocked = blocked
+        self.broken = broken
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = 0
+
+    async def send_message(self, chat_id: int, text: str, reply_markup=None) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        self.sent += 1
+        if chat_id in self.blocked:
+            raise TelegramForbiddenError(SendMessage(chat_id=chat_id, text=text), "bot was blocked by the user")
+        if chat_id in self.broken:
+            raise RuntimeError("network is down")
+
+
+async def test_reminders_are_sent_concurrently_and_marked_in_batches(db: "DatabaseConnector"):
+    long_ago = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    async with db.session_factory.begin() as session:
+        for user_id in range(1, 11):
+            session.add(User(id=user_id, telegram_id=user_id + 100, fullname="abacaba", last_reminded_at=long_ago))
+
+    reminder_due = long_ago + timedelta(days=365)
+    batches = []
+
+    async def mark_reminded(user_ids: list[int]) -> None:
+        batches.append(sorted(user_ids))
+        async with db.session_factory.begin() as session:
+            await mark_users_reminded(user_ids, reminder_due, session)
+
+    bot = FakeBot(blocked={103}, broken={104})
+    reminders = [Reminder(user_id=user_id, telegram_id=user_id + 100, text="hi") for user_id in range(1, 11)]
+    stats = await send_reminders(bot, as_stream(reminders), mark_reminded, concurrency=4, batch_size=3)
+
+    assert (stats.sent, stats.refused, stats.failed) == (8, 1, 1)
+    assert 1 < bot.max_in_flight <= 4
+    assert sorted(user_id for batch in batches for user_id in batch) == [1, 2, 3, 5, 6, 7, 8, 9, 10]
+    assert all(len(batch) == 3 for batch in batches)
+
+    async with db.session_factory() as session:
+        not_reminded = await session.scalars(select(User.id).filter(User.last_reminded_at == long_ago))
+    assert list(not_reminded) == [4]
+
+
+async def test_failed_marking_stops_all_workers():
+    async def mark_reminded(user_ids: list[int]) -> None:
+        raise RuntimeError("database is down")
+
+    bot = FakeBot(blocked=set(), broken=set())
+    reminders = [Reminder(user_id=user_id, telegram_id=user_id + 100, text="hi") for user_id in range(1, 101)]
+    with pytest.raises(ExceptionGroup):
+        await send_reminders(bot, as_stream(reminders), mark_reminded, concurrency=4, batch_size=3)
+    sent = bot.sent
+    await asyncio.sleep(0.05)
+    assert bot.sent == sent < 100
+
+
+async def test_due_recipients_match_reminder_slots(db: "DatabaseConnector"):
+    reminder_due = get_reminder_slot(datetime(2026, 10, 18, 12, tzinfo=timezone.utc))
+    offsets = [timedelta(days=days, seconds=seconds) for days in range(9) for seconds in (-1, 0, 1)]
+    users = []
+    for freq in (None, 1, 3, 7):
+        for offset in offsets:
+            users.append((len(users) + 1, freq, reminder_due - offset))
+    async with db.session_factory.begin() as session:
+        for user_id, freq, last_reminded_at in users:
+            session.add(
+                User(
+                    id=user_id,
+                    telegram_id=user_id + 1000,
+                    fullname="abacaba",
+                    reminder_freq=freq,
+                    last_reminded_at=last_reminded_at,
+                )
+            )
+
+    expected = [
+        (user_id, user_id + 1000)
+        for user_id, freq, last_reminded_at in users
+        if freq is not None and reminder_due - get_reminder_slot(last_reminded_at) >= timedelta(days=freq)
+    ]
+    pages = []
+    async with db.session_factory() as session:
+        frequencies = await get_reminder_frequencies(session)
+        after_id = 0
+        while page := await get_due_reminder_recipients(reminder_due, frequencies, after_id, 5, session):
+            pages.append(page)
+            after_id = page[-1][0]
+
+    assert sorted(frequencies) == [1, 3, 7]
+    assert all(len(page) <= 5 for page in pages)
+    assert [recipient for page in pages for recipient in page] == expected
+
+
+async def test_retried_shard_does_not_send_twice(db: "DatabaseConnector"):
+    reminder_due = datetime(2026, 10, 18, 14, tzinfo=timezone.utc)
+    run = ReminderRun(FakeAsyncRedis(), Stage.DEV, reminder_due)
+    await run.start(shards=2)
+    reminders = [Reminder(user_id=user_id, telegram_id=user_id + 100, text="hi") for user_id in range(1, 6)]
+    marked = []
+
+    async def mark_reminded(user_ids: list[int]) -> None:
+        marked.extend(user_ids)
+
+    # The first attempt died after a few sends, before anything was marked in the database.
+    bot = FakeBot(blocked=set(), broken={105})
+    first = await send_reminders(bot, as_stream(reminders[:3] + reminders[4:]), mark_reminded, run=run)
+    assert (first.sent, first.failed) == (3, 1)
+
+    # It also claimed user 4 and died before the message went out.
+    assert await run.claim(4)
+
+    marked.clear()
+    bot = FakeBot(blocked=set(), broken=set())
+    retry = await send_reminders(bot, as_stream(reminders), mark_reminded, run=run)
+    assert (retry.sent, retry.skipped) == (2, 3)
+    assert bot.sent == 2
+    assert sorted(marked) == [1, 2, 3, 4, 5]
+
+    assert await run.finish_shard(0, retry) is None
+    assert await run.finish_shard(0, retry) is None
+    # The other shard ran out of retries; the run is reported all the same.
+    summary = await run.finish_shard(1, ReminderStats(), exhausted=True)
+    assert summary == {
+        "shards": 2,
+        "sent": 2,
+        "refused": 0,
+        "failed": 0,
+        "skipped": 3,
+        "exhausted": 1,
+        "reported": 1,
+    }
+    assert await run.finish_shard(1, ReminderStats(sent=10)) is None
+
+
+async def test_shards_split_due_users_by_id(db: "DatabaseConnector"):
+    reminder_due = datetime(2026, 10, 18, 14, tzinfo=timezone.utc)
+    async with db.session_factory.begin() as session:
+        for user_id in range(1, 24):
+            session.add(
+                User(
+                    id=user_id,
+                    telegram_id=user_id + 1000,
+                    fullname="abacaba",
+                    reminder_freq=1 if user_id % 3 else None,
+                    last_reminded_at=reminder_due - timedelta(days=1),
+                )
+            )
+
+    async with db.session_factory() as session:
+        starts = await get_due_reminder_shard_starts(reminder_due, [1], 5, session)
+        shards = []
+        for first_id, before_id in zip(starts, [*starts[1:], None]):
+            shards.append(await get_due_reminder_recipients(reminder_due, [1], first_id - 1, 100, session, before_id))
+
+    assert starts == [1, 8, 16, 23]
+    assert [len(shard) for shard in shards] == [5, 5, 5, 1]
+    assert [user_id for shard in shards for user_id, _ in shard] == [i for i in range(1, 24) if i % 3]
+
+
+async def test_notifications_are_sent_concurrently():
+    bot = FakeBot(blocked={3}, broken={4})
+    stats = await send_notifications(bot, range(1, 21), "bye", concurrency=5)
+    assert (stats.sent, stats.refused, stats.failed) == (18, 1, 1)
+    assert 1 < bot.max_in_flight <= 5
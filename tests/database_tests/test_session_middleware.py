@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from bot.middlewares.session_middlewares import DBSessionMiddleware
+from database.database_connector import DatabaseConnector
+from database.models.user import User
+
+
+async def test_db_free_handler_does_not_check_out_connection(db: "DatabaseConnector"):
+    checkouts = []
+    event.listen(db.engine.sync_engine.pool, "checkout", lambda *args: checkouts.append(args))
+    middleware = DBSessionMiddleware(db)
+
+    async def db_free_handler(_, data):
+        return "pong"
+
+    assert await middleware(db_free_handler, object(), {}) == "pong"
+    assert checkouts == []
+
+    async def db_handler(_, data):
+        data["db_session"].add(
+            User(id=1, telegram_id=42, fullname="abacaba", last_reminded_at=datetime.now(timezone.utc))
+        )
+
+    await middleware(db_handler, object(), {})
+    assert len(checkouts) == 1
+    async with db.session_factory() as session:
+        assert await session.get(User, 1) is not None
@@ -0,0 +1,25 @@
+from database.models.session import Session
+
+
+def test_session_path_is_parsed_once():
+    session = Session(path="1.2.3", path_extra="7.8", current_step=0, in_extra=False)
+
+    assert list(session.get_path()) == [1, 2, 3]
+    assert session.get_path() is session.get_path()
+
+
+def test_session_path_follows_source_changes():
+    session = Session(path="1.2.3", path_extra="7.8", current_step=0, in_extra=False)
+    session.get_path()
+
+    session.path = "4.5"
+    assert list(session.get_path()) == [4, 5]
+
+    session.set_extra()
+    assert list(session.get_path()) == [7, 8]
+    assert session.get_slide() == 7
+
+    session.path_extra = "9"
+    session.current_step = 1
+    assert list(session.get_path()) == [9]
+    assert not session.has_next()
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from database.crud.session import get_session_report
+from database.database_connector import DatabaseConnector
+from database.models.lesson import Lesson
+from database.models.quiz_answer_log import QuizAnswerLog
+from database.models.session import Session
+from database.models.slide import Slide
+from database.models.user import User
+from enums import SessionStartsFrom, SlideType
+
+
+async def test_session_report_is_a_single_query(db: "DatabaseConnector"):
+    async with db.session_factory.begin() as session:
+        session.add(Lesson(id=1, title="abacaba", path="5.4.3.2.1", errors_threshold=50))
+        session.add(User(id=1, telegram_id=100500, fullname="Vasya", last_reminded_at=datetime.now(timezone.utc)))
+        session.add(Slide(id=1, lesson_id=1, slide_type=SlideType.QUIZ_OPTIONS, is_exam_slide=True))
+        session.add(Slide(id=2, lesson_id=1, slide_type=SlideType.QUIZ_INPUT_WORD, is_exam_slide=True))
+        session.add(Slide(id=3, lesson_id=1, slide_type=SlideType.QUIZ_INPUT_PHRASE))
+        session.add(Slide(id=4, lesson_id=1, slide_type=SlideType.QUIZ_OPTIONS))
+        session.add(Slide(id=5, lesson_id=1, slide_type=SlideType.TEXT))
+        session.add(Slide(id=6, lesson_id=1, slide_type=SlideType.QUIZ_OPTIONS))
+        session.add(
+            Session(id=1, lesson_id=1, user_id=1, path="5.4.3.2.1", starts_from=SessionStartsFrom.BEGIN),
+        )
+    async with db.session_factory.begin() as session:
+        for slide_id, is_correct in ((4, False), (4, True), (3, True), (2, False), (2, False), (1, True), (6, False)):
+            session.add(
+                QuizAnswerLog(
+                    session_id=1, slide_id=slide_id, slide_type=SlideType.QUIZ_OPTIONS, is_correct=is_correct
+                )
+            )
+
+    statements = []
+    event.listen(db.engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    async with db.session_factory() as session:
+        user_session = await session.get(Session, 1)
+        statements.clear()
+        report = await get_session_report(user_session, session)
+
+    assert len(statements) == 1
+    assert report.lesson.title == "abacaba"
+    assert (report.regular_exercises, report.correct_regular_answers) == (2, 1)
+    assert (report.exam_exercises, report.correct_exam_answers) == (2, 1)
+    assert report.first_exam_slide_id == 2
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from database.crud.lesson_slide import sync_lesson_slides
+from database.crud.quiz_answer import log_quiz_answer
+from database.database_connector import DatabaseConnector
+from database.models.lesson import Lesson
+from database.models.session import Session
+from database.models.slide import Slide
+from database.models.user import User
+from enums import SessionStartsFrom, SlideType
+from webapp.controllers.statistics import get_errors_stats_table_content
+
+
+async def test_error_stats_take_a_constant_number_of_queries(db: "DatabaseConnector"):
+    async with db.session_factory.begin() as session:
+        lessons = [
+            Lesson(id=1, title="first", path="3.1", path_extra="2"),
+            Lesson(id=2, title="second", path="4"),
+        ]
+        session.add_all(lessons)
+        session.add(User(id=1, telegram_id=100500, fullname="Vasya", last_reminded_at=datetime.now(timezone.utc)))
+        for slide_id, lesson_id in ((1, 1), (2, 1), (3, 1), (4, 2), (5, 2)):
+            session.add(Slide(id=slide_id, lesson_id=lesson_id, slide_type=SlideType.QUIZ_OPTIONS))
+        session.add(Session(id=1, lesson_id=1, user_id=1, path="3.1", starts_from=SessionStartsFrom.BEGIN))
+        await session.flush()
+        for lesson in lessons:
+            await sync_lesson_slides(lesson, session)
+    async with db.session_factory.begin() as session:
+        # Slide 5 is no longer in any path, so it is dropped before ranking.
+        for slide_id, is_correct in (
+            (1, False),
+            (2, False),
+            (2, True),
+            (3, True),
+            (4, False),
+            (4, True),
+            (4, True),
+            (5, False),
+        ):
+            await log_quiz_answer(1, slide_id, SlideType.QUIZ_OPTIONS, is_correct, session)
+
+    statements = []
+    event.listen(db.engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    async with db.session_factory() as session:
+        stats = await get_errors_stats_table_content(limit=10, db_session=session, min_attempts=1)
+        statements_per_page = len(statements)
+        top_two = await get_errors_stats_table_content(limit=2, db_session=session, min_attempts=1)
+        well_tried = await get_errors_stats_table_content(limit=10, db_session=session, min_attempts=2)
+
+    assert statements_per_page == 2
+    assert [(row.slide_id, row.lesson_title, row.link, row.correctness_rate) for row in stats] == [
+        ("1", "first", "/slides/edit/regular/quiz_options/1/2/", "0%"),
+        ("2", "first", "/slides/edit/extra/quiz_options/2/1/", "50%"),
+        ("4", "second", "/slides/edit/regular/quiz_options/4/1/", "67%"),
+        ("3", "first", "/slides/edit/regular/quiz_options/3/1/", "100%"),
+    ]
+    assert [row.slide_id for row in top_two] == ["1", "2"]
+    assert [row.slide_id for row in well_tried] == ["2", "4"]
@@ -0,0 +1,19 @@
+from database.crud import answer
+from database.crud.answer import get_random_sticker_id
+from database.database_connector import DatabaseConnector
+from database.models.sticker import Sticker
+from enums import StickerType
+
+
+async def test_sticker_ids_are_cached_per_type(db: "DatabaseConnector"):
+    answer.stickers_loaded_at = None
+    async with db.session_factory.begin() as session:
+        session.add(Sticker(sticker_id="small-1", sticker_type=StickerType.SMALL))
+        session.add(Sticker(sticker_id="small-2", sticker_type=StickerType.SMALL))
+        session.add(Sticker(sticker_id="big-1", sticker_type=StickerType.BIG))
+
+    async with db.session_factory() as session:
+        assert await get_random_sticker_id(StickerType.BIG, session) == "big-1"
+
+    picks = {await get_random_sticker_id(StickerType.SMALL, db_session=object()) for _ in range(50)}
+    assert picks == {"small-1", "small-2"}
@@ -0,0 +1,29 @@
+from database.crud import answer
+from database.crud.answer import get_text_by_prompt, invalidate_texts_cache
+from database.database_connector import DatabaseConnector
+from database.invalidation import publish_invalidation
+from database.models.text import Text
+from enums import CacheScope
+
+
+async def test_texts_are_served_from_memory(db: "DatabaseConnector"):
+    invalidate_texts_cache()
+    async with db.session_factory.begin() as session:
+        session.add(Text(prompt="start_message", text="hi", description=""))
+        session.add(Text(prompt="right_answer", text="{}", description=""))
+
+    async with db.session_factory() as session:
+        assert await get_text_by_prompt("start_message", session) == "hi"
+
+    # Warm lookups, including misses, never touch the database.
+    assert await get_text_by_prompt("right_answer", db_session=object()) == "{}"
+    assert "missing" in await get_text_by_prompt("missing", db_session=object())
+
+    async with db.session_factory.begin() as session:
+        text = await session.get(Text, 1)
+        text.text = "hello"
+    await publish_invalidation(CacheScope.TEXTS)
+    assert answer.texts_loaded_at is None
+
+    async with db.session_factory() as session:
+        assert await get_text_by_prompt("start_message", session) == "hello"
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import event, select
+
+from database.database_connector import DatabaseConnector
+from database.invalidation import publish_invalidation
+from database.models.user import User
+from database.user_cache import UserCache, user_cache
+from enums import CacheScope, UserSubscriptionType
+
+
+async def test_cached_user_skips_select_and_persists_changes(db: "DatabaseConnector"):
+    async with db.session_factory.begin() as session:
+        session.add(User(id=1, telegram_id=42, fullname="abacaba", last_reminded_at=datetime.now(timezone.utc)))
+
+    cache = UserCache()
+    async with db.session_factory() as session:
+        assert cache.get(42, session) is None
+        cache.put(await session.get(User, 1))
+
+    statements = []
+    event.listen(db.engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    async with db.session_factory() as session:
+        user = cache.get(42, session)
+        assert user.fullname == "abacaba"
+        user.subscription_status = UserSubscriptionType.LIMITED_ACCESS
+        await session.commit()
+    assert not any(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    async with db.session_factory() as session:
+        user = await session.scalar(select(User).where(User.telegram_id == 42))
+    assert user.subscription_status == UserSubscriptionType.LIMITED_ACCESS
+
+
+async def test_user_cache_expires_and_invalidates(db: "DatabaseConnector"):
+    async with db.session_factory.begin() as session:
+        session.add(User(id=1, telegram_id=42, fullname="abacaba", last_reminded_at=datetime.now(timezone.utc)))
+
+    async with db.session_factory() as session:
+        user = await session.get(User, 1)
+        user_cache.put(user)
+        await publish_invalidation(CacheScope.USERS, user.telegram_id)
+        assert user_cache.get(42, session) is None
+
+        expired = UserCache(ttl=-1)
+        expired.put(user)
+        assert expired.get(42, session) is None
@@ -1,17 +1,21 @@
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 import random
 
 import pytest
+from sqlalchemy import select
 
 from database.crud.user import (
     add_user_to_db,
+    expire_subscriptions,
     get_all_users_with_reminders,
+    get_telegram_ids_with_subscription_expiring_on,
     get_user_from_db_by_tg_id,
     set_user_reminders,
     update_last_reminded_at,
 )
 from database.models.user import User as UserDbModel
+from enums import UserSubscriptionType
 
 
 # TODO: разобраться как обходить констраинты
@@ -91,3 +95,41 @@ async def test_update_last_reminded_at(user_db_model: UserDbModel, db, user: Use
         selected_user = await get_user_from_db_by_tg_id(user.id, session)
 
     assert selected_user.last_reminded_at == dt
+
+
+async def test_expire_subscriptions(db):
+    today = date(2026, 10, 18)
+    subscriptions = [
+        (UserSubscriptionType.LIMITED_ACCESS, today - timedelta(days=3)),
+        (UserSubscriptionType.LIMITED_ACCESS, today),
+        (UserSubscriptionType.LIMITED_ACCESS, today + timedelta(days=1)),
+        (UserSubscriptionType.LIMITED_ACCESS, None),
+        (UserSubscriptionType.UNLIMITED_ACCESS, today),
+    ]
+    async with db.session_factory.begin() as session:
+        for i, (status, expired_at) in enumerate(subscriptions, start=1):
+            session.add(
+                UserDbModel(
+                    id=i,
+                    telegram_id=i + 100,
+                    fullname="aba",
+                    last_reminded_at=datetime.now(timezone.utc),
+                    subscription_status=status,
+                    subscription_expired_at=expired_at,
+                )
+            )
+
+    async with db.session_factory.begin() as session:
+        assert await get_telegram_ids_with_subscription_expiring_on(today + timedelta(days=1), session) == [103]
+        assert sorted(await expire_subscriptions(today, session)) == [101, 102]
+
+    async with db.session_factory() as session:
+        statuses = await session.scalars(select(UserDbModel.subscription_status).order_by(UserDbModel.id))
+        assert list(statuses) == [
+            UserSubscriptionType.ACCESS_EXPIRED,
+            UserSubscriptionType.ACCESS_EXPIRED,
+            UserSubscriptionType.LIMITED_ACCESS,
+            UserSubscriptionType.LIMITED_ACCESS,
+            UserSubscriptionType.UNLIMITED_ACCESS,
+        ]
+        assert await expire_subscriptions(today, session) == []
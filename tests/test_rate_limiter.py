@@ -0,0 +1,80 @@
+from aiohttp import web
+from fakeredis import FakeAsyncRedis
+from pydantic import SecretStr
+
+from bot.internal.client import create_bot
+from bot.internal.rate_limiter import RateLimiterMiddleware, TelegramRateLimiter
+from config import Settings
+from enums import Stage
+
+
+class FakeLimiter:
+    def __init__(self):
+        self.acquired = []
+        self.paused = []
+
+    async def acquire(self, chat_id):
+        self.acquired.append(chat_id)
+
+    async def pause(self, chat_id, seconds):
+        self.paused.append((chat_id, seconds))
+
+
+async def test_flood_control_is_retried_after_pause():
+    requests = []
+
+    async def handle(request: web.Request) -> web.Response:
+        requests.append(request.match_info["method"])
+        if requests.count("sendMessage") == 1:
+            return web.json_response(
+                {"ok": False, "error_code": 429, "description": "Too Many Requests", "parameters": {"retry_after": 3}},
+            )
+        if request.match_info["method"] in ("answerCallbackQuery", "sendChatAction"):
+            return web.json_response({"ok": True, "result": True})
+        message = {"message_id": 1, "date": 0, "chat": {"id": 42, "type": "private"}, "text": "hello"}
+        return web.json_response({"ok": True, "result": message})
+
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    settings = Settings.model_construct(
+        BOT_TOKEN=SecretStr("42:TEST"),
+        TELEGRAM_API_URL=f"http://127.0.0.1:{runner.addresses[0][1]}",
+        STAGE=Stage.DEV,
+    )
+    limiter = FakeLimiter()
+    bot = create_bot(settings)
+    bot.session.middleware(RateLimiterMiddleware(limiter))
+    try:
+        message = await bot.send_message(chat_id=42, text="hello")
+        await bot.send_chat_action(chat_id=42, action="typing")
+        await bot.answer_callback_query("1")
+    finally:
+        await bot.session.close()
+        await runner.cleanup()
+
+    assert message.text == "hello"
+    assert requests == ["sendMessage", "sendMessage", "sendChatAction", "answerCallbackQuery"]
+    # Only new messages are charged against the chat; the chat action counts for the whole bot alone.
+    assert limiter.acquired == [42, 42, None]
+    assert limiter.paused == [(42, 3)]
+
+
+async def test_acquire_script_shares_buckets_and_pauses():
+    limiter = TelegramRateLimiter(FakeAsyncRedis(), Stage.DEV, global_rate=30, chat_rate=1, chat_burst=2)
+    try:
+        assert await limiter.try_acquire(42) == 0
+        assert await limiter.try_acquire(42) == 0
+        assert 0 < await limiter.try_acquire(42) <= 1000
+        assert await limiter.try_acquire(43) == 0
+        assert await limiter.try_acquire() == 0
+
+        # A flood wait from one chat holds back every other chat and the bot-wide requests too.
+        await limiter.pause(42, 3)
+        assert 2000 < await limiter.try_acquire(43) <= 3000
+        assert 2000 < await limiter.try_acquire() <= 3000
+    finally:
+        await limiter.redis.aclose()
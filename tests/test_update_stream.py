@@ -0,0 +1,168 @@
+import asyncio
+from collections import defaultdict
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message
+from aiohttp import web
+from httpx import ASGITransport, AsyncClient
+from pydantic import SecretStr
+
+from bot.internal.client import create_bot
+from bot.update_stream import consume_updates, get_partition, get_update_stream, publish_update
+from bot.webhook import WEBHOOK_PATH, create_webhook_app
+from config import Settings
+from enums import Stage
+
+
+class FakeStreamRedis:
+    def __init__(self):
+        self.streams = defaultdict(list)
+        self.pending = defaultdict(list)
+        self.delivered = defaultdict(int)
+
+    async def xadd(self, stream, fields, maxlen=None, approximate=True):
+        entry_id = f"{len(self.streams[stream]) + 1}-0".encode()
+        self.streams[stream].append((entry_id, {key.encode(): value.encode() for key, value in fields.items()}))
+        return entry_id
+
+    async def xgroup_create(self, stream, group, id, mkstream):
+        return True
+
+    async def xreadgroup(self, group, consumer, streams, count, block):
+        ((stream, last_id),) = streams.items()
+        if last_id != ">":
+            return [[stream, [entry for entry in self.pending[stream] if entry[0] > last_id.encode()]]]
+        entries = self.streams[stream][self.delivered[stream] :][:count]
+        if not entries:
+            await asyncio.sleep(0.01)
+            return []
+        self.delivered[stream] += len(entries)
+        self.pending[stream].extend(entries)
+        return [[stream, entries]]
+
+    async def xack(self, stream, group, entry_id):
+        self.pending[stream] = [entry for entry in self.pending[stream] if entry[0] != entry_id]
+
+
+def make_update(update_id: int, user_id: int, text: str) -> dict:
+    user = {"id": user_id, "is_bot": False, "first_name": "abacaba"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": user_id, "type": "private"},
+            "from": user,
+            "text": text,
+        },
+    }
+
+
+async def fake_telegram_server(sent: list[dict]) -> web.AppRunner:
+    async def handle(request: web.Request) -> web.Response:
+        payload = dict(await request.post())
+        sent.append(payload)
+        message = {"message_id": len(sent), "date": 0, "chat": {"id": int(payload["chat_id"]), "type": "private"}}
+        return web.json_response({"ok": True, "result": message})
+
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def test_updates_are_partitioned_by_user():
+    assert get_partition(make_update(1, 42, "a"), 8) == get_partition(make_update(2, 42, "b"), 8) == 42 % 8
+    assert get_partition({"update_id": 5, "my_chat_member": {"chat": {"id": 7}}}, 4) == 3
+    assert get_partition({"update_id": 5}, 4) == 1
+
+
+async def test_webhook_updates_reach_dispatcher_in_order():
+    sent = []
+    runner = await fake_telegram_server(sent)
+    port = runner.addresses[0][1]
+    settings = Settings.model_construct(
+        BOT_TOKEN=SecretStr("42:TEST"),
+        TELEGRAM_API_URL=f"http://127.0.0.1:{port}",
+        WEBHOOK_SECRET=SecretStr("secret"),
+        STAGE=Stage.DEV,
+        UPDATE_STREAM_PARTITIONS=4,
+    )
+    redis = FakeStreamRedis()
+    bot = create_bot(settings)
+
+    router = Router()
+
+    @router.message()
+    async def echo(message: Message) -> None:
+        await message.answer(message.text)
+
+    dispatcher = Dispatcher()
+    dispatcher.include_router(router)
+
+    app = create_webhook_app(settings, redis)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(WEBHOOK_PATH, json=make_update(1, 42, "first"))
+        assert response.status_code == 403
+        for update_id, text in enumerate(["first", "second", "third"], start=1):
+            response = await client.post(
+                WEBHOOK_PATH,
+                json=make_update(update_id, 42, text),
+                headers={"X-Telegram-Bot-Api-Secret-Token": "secret"},
+            )
+            assert response.status_code == 200
+
+    stream = get_update_stream(Stage.DEV, 42 % 4)
+    consumer = asyncio.create_task(consume_updates(redis, stream, bot, dispatcher))
+    try:
+        async with asyncio.timeout(5):
+            # Entries are acked once their handler returns, just after the reply went out.
+            while len(sent) < 3 or redis.pending[stream]:
+                await asyncio.sleep(0.01)
+    finally:
+        consumer.cancel()
+        await bot.session.close()
+        await runner.cleanup()
+
+    assert [payload["text"] for payload in sent] == ["first", "second", "third"]
+    assert redis.pending[stream] == []
+
+
+async def test_slow_user_does_not_hold_back_partition():
+    redis = FakeStreamRedis()
+    bot = Bot("42:TEST")
+    assert get_partition(make_update(1, 42, "a"), 4) == get_partition(make_update(2, 46, "b"), 4)
+    for update_id, (user_id, text) in enumerate([(42, "slow"), (42, "after slow"), (46, "fast")], start=1):
+        await publish_update(redis, Stage.DEV, 4, make_update(update_id, user_id, text))
+
+    handled = []
+    release = asyncio.Event()
+    router = Router()
+
+    @router.message()
+    async def delay(message: Message) -> None:
+        if message.text == "slow":
+            await release.wait()
+        handled.append(message.text)
+
+    dispatcher = Dispatcher()
+    dispatcher.include_router(router)
+    stream = get_update_stream(Stage.DEV, 42 % 4)
+    consumer = asyncio.create_task(consume_updates(redis, stream, bot, dispatcher))
+    try:
+        async with asyncio.timeout(5):
+            while handled != ["fast"]:
+                await asyncio.sleep(0.01)
+            assert [entry_id for entry_id, _ in redis.pending[stream]] == [b"1-0", b"2-0"]
+            release.set()
+            while len(handled) < 3:
+                await asyncio.sleep(0.01)
+            while redis.pending[stream]:
+                await asyncio.sleep(0.01)
+    finally:
+        consumer.cancel()
+        await bot.session.close()
+
+    assert handled == ["fast", "slow", "after slow"]